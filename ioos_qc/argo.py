@@ -2,14 +2,13 @@
 """Tests based on the ARGO QC manual."""
 
 import logging
-import warnings
 from collections.abc import Sequence
 from numbers import Real as N
 
 import numpy as np
 
 from ioos_qc.qartod import QartodFlags
-from ioos_qc.utils import add_flag_metadata, great_circle_distance, mapdates
+from ioos_qc.utils import add_flag_metadata, great_circle_distance, mapdates, to_float_array
 
 L = logging.getLogger(__name__)
 
@@ -98,11 +97,9 @@ def speed_test(
         A masked array of flag values equal in size to that of the input.
 
     """
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        lat = np.ma.masked_invalid(np.array(lat).astype(np.float64))
-        lon = np.ma.masked_invalid(np.array(lon).astype(np.float64))
-        tinp = mapdates(tinp)
+    lat = np.ma.masked_invalid(to_float_array(lat))
+    lon = np.ma.masked_invalid(to_float_array(lon))
+    tinp = mapdates(tinp)
 
     if lon.shape != lat.shape or lon.shape != tinp.shape:
         msg = f"Lon ({lon.shape}) and lat ({lat.shape}) and tinp ({tinp.shape}) must be the same shape"
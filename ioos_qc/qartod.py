@@ -2,18 +2,26 @@
 """Tests based on the IOOS QARTOD manuals."""
 
 import logging
-import warnings
 from collections import namedtuple
 from collections.abc import Sequence
+from itertools import groupby
 from numbers import Real as N
 from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
 
 try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+try:
+    from numba import njit
     from numba.core.errors import NumbaTypeError
 except ImportError:
+    njit = None
     NumbaTypeError = TypeError
 
 from ioos_qc.utils import (
@@ -22,6 +30,7 @@ from ioos_qc.utils import (
     isfixedlength,
     isnan,
     mapdates,
+    to_float_array,
 )
 
 L = logging.getLogger(__name__)
@@ -59,6 +68,23 @@ def aggregate(results: List) -> np.ma.MaskedArray:
     return qartod_compare(all_tests)
 
 
+# Flags in increasing order of precedence for qartod_compare
+_PRIORITY_FLAGS = np.array(
+    [
+        QartodFlags.MISSING,
+        QartodFlags.UNKNOWN,
+        QartodFlags.GOOD,
+        QartodFlags.SUSPECT,
+        QartodFlags.FAIL,
+    ],
+    dtype="uint8",
+)
+# Lookup table of flag value -> index in _PRIORITY_FLAGS. Anything that is not
+# a flag, including values clipped to either end, ranks as MISSING.
+_FLAG_PRIORITY = np.zeros(256, dtype="uint8")
+_FLAG_PRIORITY[_PRIORITY_FLAGS] = np.arange(_PRIORITY_FLAGS.size)
+
+
 def qartod_compare(
     vectors: Sequence[Sequence[N]],
 ) -> np.ma.MaskedArray:
@@ -80,23 +106,34 @@ def qartod_compare(
     assert all(s == shapes[0] for s in shapes)
     assert all(v.ndim == 1 for v in vectors)
 
-    result = np.ma.empty(shapes[0])
-    result.fill(QartodFlags.MISSING)
+    # Masked flags are ignored, as are values that are not QARTOD flags
+    stack = np.stack([np.ma.filled(v, 0) for v in vectors])
+    if stack.dtype.kind not in "iu":
+        stack = np.where(np.isin(stack, _PRIORITY_FLAGS), stack, 0).astype(np.intp)
 
-    priorities = [
-        QartodFlags.MISSING,
-        QartodFlags.UNKNOWN,
-        QartodFlags.GOOD,
-        QartodFlags.SUSPECT,
-        QartodFlags.FAIL,
-    ]
-    # For each of the priorities in order, set the resultant array to the the
-    # flag where that flag exists in each of the vectors.
-    for p in priorities:
-        for v in vectors:
-            idx = np.where(v == p)[0]
-            result[idx] = p
-    return result.astype("uint8")
+    # Rank every flag by precedence, take the highest rank and map it back
+    ranks = _FLAG_PRIORITY.take(stack, mode="clip").max(axis=0)
+    return np.ma.masked_array(_PRIORITY_FLAGS[ranks])
+
+
+def _select_flags(conditions, flags, default=QartodFlags.GOOD):
+    """Return uint8 flags set from the first true condition, like ``np.select``.
+
+    The conditions are packed into the bits of a uint8 index which is looked
+    up in a table of ``2 ** len(conditions)`` flags, so the output is written
+    in a single gather instead of one pass per condition.
+    """
+    index = np.zeros(np.shape(conditions[0]), dtype="uint8")
+    for condition in conditions:
+        index <<= 1
+        index |= condition
+
+    # Earlier conditions are in the higher bits and are written last so they win
+    table = np.full(1 << len(conditions), default, dtype="uint8")
+    entries = np.arange(table.size)
+    for bit, flag in enumerate(reversed(flags)):
+        table[(entries >> bit) & 1 == 1] = flag
+    return table[index]
 
 
 @add_flag_metadata(
@@ -139,10 +176,8 @@ def location_test(
         assert isfixedlength(bbox, 4)
         bbox = bboxnt(*bbox)
 
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        lat = np.ma.masked_invalid(np.array(lat).astype(np.float64))
-        lon = np.ma.masked_invalid(np.array(lon).astype(np.float64))
+    lat = np.ma.masked_invalid(to_float_array(lat))
+    lon = np.ma.masked_invalid(to_float_array(lon))
 
     if lon.shape != lat.shape:
         msg = f"Lon ({lon.shape}) and lat ({lat.shape}) are different shapes"
@@ -215,9 +250,7 @@ def gross_range_test(
     assert isfixedlength(fail_span, 2)
     sspan = span(*sorted(fail_span))
 
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        inp = np.ma.masked_invalid(np.array(inp).astype(np.float64))
+    inp = np.ma.masked_invalid(to_float_array(inp))
 
     # Save original shape
     original_shape = inp.shape
@@ -375,6 +408,28 @@ class ClimatologyConfig:
             ),
         )
 
+    def _runs(self):
+        """Split the members into runs that can be checked together.
+
+        Consecutive date range members without a period or zspan and with disjoint
+        tspans match each time at most once, so the order they are applied in
+        doesn't matter and the run is checked with one binary search over its
+        sorted tspans. Every other member is checked on its own, in order.
+        """
+        runs = []
+        for mergeable, members in groupby(
+            self._members,
+            key=lambda m: m.period is None and isnan(m.zspan),
+        ):
+            group = list(members)
+            if mergeable and len(group) > 1:
+                ordered = sorted(group, key=lambda m: m.tspan.minv)
+                if all(a.tspan.maxv < b.tspan.minv for a, b in zip(ordered, ordered[1:])):
+                    runs.append(ordered)
+                    continue
+            runs.extend([m] for m in group)
+        return runs
+
     def check(self, tinp, inp, zinp):
         # Start with everything as UNKNOWN (2)
         flag_arr = np.ma.empty(inp.size, dtype="uint8")
@@ -383,10 +438,14 @@ class ClimatologyConfig:
         # If the value is masked set the flag to MISSING
         flag_arr[inp.mask] = QartodFlags.MISSING
 
-        # Iterate over each member and apply its spans on the input data.
-        # Member spans are applied in order and any data points that fall into
-        # more than one member are flagged by each one.
-        for m in self._members:
+        # Apply the member spans on the input data in order. Any data points that
+        # fall into more than one member are flagged by each one.
+        for run in self._runs():
+            if len(run) > 1:
+                self._check_run(run, tinp, inp, flag_arr)
+                continue
+
+            m = run[0]
             if m.period is not None:
                 # If a period is defined, extract the attribute from the
                 # pd.DatetimeIndex object before comparison. The min and max
@@ -448,6 +507,40 @@ class ClimatologyConfig:
 
         return flag_arr
 
+    def _check_run(self, run, tinp, inp, flag_arr):
+        """Flag ``inp`` against a run of date range members sorted by, and disjoint in, tspan."""
+        t = tinp.to_numpy()
+        starts = pd.Index([m.tspan.minv for m in run]).to_numpy()
+        ends = pd.Index([m.tspan.maxv for m in run]).to_numpy()
+
+        # The only member that can hold each time is the last one starting at or before it
+        member = np.searchsorted(starts, t, side="right") - 1
+        t_idx = member >= 0
+        member[~t_idx] = 0
+        t_idx &= t <= ends[member]
+
+        # Value spans of each time's member, a NaN fail span never fails
+        vmin, vmax, fmin, fmax = np.array(
+            [
+                (
+                    m.vspan.minv,
+                    m.vspan.maxv,
+                    np.nan if isnan(m.fspan) else m.fspan.minv,
+                    np.nan if isnan(m.fspan) else m.fspan.maxv,
+                )
+                for m in run
+            ],
+            dtype=np.float64,
+        ).T.take(member, axis=1)
+
+        values_idx = t_idx & np.ma.array(data=~np.isnan(inp.data), mask=inp.mask)
+        with np.errstate(invalid="ignore"):
+            fail_idx = (inp < fmin) | (inp > fmax)
+            suspect_idx = (inp < vmin) | (inp > vmax)
+            flag_arr[(values_idx & fail_idx)] = QartodFlags.FAIL
+            flag_arr[(values_idx & ~fail_idx & suspect_idx)] = QartodFlags.SUSPECT
+            flag_arr[(values_idx & ~fail_idx & ~suspect_idx)] = QartodFlags.GOOD
+
     @staticmethod
     def convert(config):
         # Create a ClimatologyConfig object if one was not passed in
@@ -500,10 +593,8 @@ def climatology_test(
     config = ClimatologyConfig.convert(config)
 
     tinp = mapdates(tinp)
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        inp = np.ma.masked_invalid(np.array(inp).astype(np.float64))
-        zinp = np.ma.masked_invalid(np.array(zinp).astype(np.float64))
+    inp = np.ma.masked_invalid(to_float_array(inp))
+    zinp = np.ma.masked_invalid(to_float_array(zinp))
 
     # Save original shape
     original_shape = inp.shape
@@ -562,9 +653,7 @@ def spike_test(
         A masked array of flag values equal in size to that of the input.
 
     """
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        inp = np.ma.masked_invalid(np.array(inp).astype(np.float64))
+    inp = np.ma.masked_invalid(to_float_array(inp))
 
     # Save original shape
     original_shape = inp.shape
@@ -652,32 +741,93 @@ def rate_of_change_test(
         A masked array of flag values equal in size to that of the input.
 
     """
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        inp = np.ma.masked_invalid(np.array(inp).astype(np.float64))
+    inp = np.ma.masked_invalid(to_float_array(inp))
 
     # Save original shape
     original_shape = inp.shape
     inp = inp.flatten()
 
-    # Start with everything as passing (1)
-    flag_arr = np.ma.ones(inp.size, dtype="uint8")
-
-    # calculate rate of change in units/second
-    roc = np.ma.zeros(inp.size, dtype="float")
-
+    # calculate rate of change in units/second on plain arrays; masked values
+    # become NaN so they are never flagged. Repeated timestamps compare the raw
+    # difference, as the masked division used here previously did.
     tinp = mapdates(tinp).flatten()
-    roc[1:] = np.abs(
-        np.diff(inp) / np.diff(tinp).astype("timedelta64[s]").astype(float),
+    dt = np.diff(tinp).astype("timedelta64[s]").astype(np.float64)
+    dt[dt == 0] = 1
+    is_suspect = np.zeros(inp.size, dtype=bool)
+    with np.errstate(invalid="ignore"):
+        roc = np.abs(np.diff(inp.filled(np.nan)) / dt)
+        is_suspect[1:] = roc > threshold
+
+    # Masked values are MISSING, everything else not flagged is passing (1)
+    flag_arr = _select_flags(
+        [np.ma.getmaskarray(inp), is_suspect],
+        [QartodFlags.MISSING, QartodFlags.SUSPECT],
     )
 
-    with np.errstate(invalid="ignore"):
-        flag_arr[roc > threshold] = QartodFlags.SUSPECT
+    return np.ma.masked_array(flag_arr.reshape(original_shape))
 
-    # If the value is masked set the flag to MISSING
-    flag_arr[inp.mask] = QartodFlags.MISSING
 
-    return flag_arr.reshape(original_shape)
+def _flat_line_kernel(values, count, tolerance, flat):
+    """Set ``flat[i]`` where the window ``values[i - count:i + 1]`` spans less than ``tolerance``.
+
+    NaNs are skipped and all-NaN windows are never flat. The window minimum and
+    maximum are tracked with monotonic index queues, so each value is pushed and
+    popped once and the scan is O(n) regardless of the window length.
+    """
+    n = values.size
+    maxq = np.empty(n, dtype=np.int64)
+    minq = np.empty(n, dtype=np.int64)
+    max_head = max_tail = min_head = min_tail = 0
+    for i in range(n):
+        # Drop indices that have fallen out of the window
+        start = i - count
+        while max_head < max_tail and maxq[max_head] < start:
+            max_head += 1
+        while min_head < min_tail and minq[min_head] < start:
+            min_head += 1
+
+        v = values[i]
+        if not np.isnan(v):
+            while max_tail > max_head and values[maxq[max_tail - 1]] <= v:
+                max_tail -= 1
+            maxq[max_tail] = i
+            max_tail += 1
+            while min_tail > min_head and values[minq[min_tail - 1]] >= v:
+                min_tail -= 1
+            minq[min_tail] = i
+            min_tail += 1
+
+        # Points before the end of the first window are never flagged
+        if i >= count and max_head < max_tail:
+            flat[i] = values[maxq[max_head]] - values[minq[min_head]] < tolerance
+
+
+if njit is not None:
+    _flat_line_kernel = njit(cache=True)(_flat_line_kernel)
+
+
+def _flat_line_filter(values, count, tolerance):
+    """Return where the window ``values[i - count:i + 1]`` spans less than ``tolerance``.
+
+    Gives the same result as ``_flat_line_kernel`` using scipy's O(n) running
+    maximum and minimum filters, for when numba is not installed.
+    """
+    flat = np.zeros(values.size, dtype=bool)
+    if count >= values.size:
+        return flat
+
+    # NaNs never set the window extremes, all-NaN windows are never flat
+    missing = np.isnan(values)
+    size = count + 1
+    highs = maximum_filter1d(np.where(missing, -np.inf, values), size, origin=count // 2)
+    lows = minimum_filter1d(np.where(missing, np.inf, values), size, origin=count // 2)
+    valid = np.concatenate([[0], np.cumsum(~missing)])
+    has_values = valid[size:] > valid[:-size]
+
+    # Points before the end of the first window are never flagged
+    with np.errstate(invalid="ignore"):
+        flat[count:] = has_values & (highs[count:] - lows[count:] < tolerance)
+    return flat
 
 
 @add_flag_metadata(
@@ -721,16 +871,14 @@ def flat_line_test(
 
     """
     # input as numpy arr
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        inp = np.ma.masked_invalid(np.array(inp).astype(np.float64))
+    inp = np.ma.masked_invalid(to_float_array(inp))
 
     # Save original shape
     original_shape = inp.shape
     inp = inp.flatten()
 
     # Start with everything as passing
-    flag_arr = np.full((inp.size,), QartodFlags.GOOD)
+    flag_arr = np.full((inp.size,), QartodFlags.GOOD, dtype="uint8")
 
     # if we have fewer than 3 points, we can't run the test, so everything passes
     if len(inp) < 3:
@@ -742,39 +890,96 @@ def flat_line_test(
     # The thresholds are in seconds so we round make sure the interval is also in seconds
     time_interval = np.median(np.diff(tinp)).astype("timedelta64[s]").astype(float)
 
-    def rolling_window(a, window):
-        """https://rigtorp.se/2011/01/01/rolling-statistics-numpy.html."""
-        if len(a) < window:
-            return np.ma.MaskedArray(np.empty((0, window + 1)))
-        shape = a.shape[:-1] + (a.shape[-1] - window + 1, window + 1)
-        strides = (*a.strides, a.strides[-1])
-        arr = np.lib.stride_tricks.as_strided(a, shape=shape, strides=strides)
-        return np.ma.masked_invalid(arr[:-1, :])
-
-    def run_test(test_threshold, flag_value) -> None:
+    def run_test(test_threshold):
         # convert time thresholds to number of observations
-        count = (int(test_threshold) / time_interval).astype(int)
+        count = int((int(test_threshold) / time_interval).astype(int))
+
+        if njit is None:
+            return _flat_line_filter(inp.filled(np.nan), count, tolerance)
+        flat = np.zeros(inp.size, dtype=bool)
+        _flat_line_kernel(inp.filled(np.nan), count, float(tolerance), flat)
+        return flat
+
+    # Masked values are MISSING and FAIL takes precedence over SUSPECT
+    flag_arr = _select_flags(
+        [np.ma.getmaskarray(inp), run_test(fail_threshold), run_test(suspect_threshold)],
+        [QartodFlags.MISSING, QartodFlags.FAIL, QartodFlags.SUSPECT],
+    )
 
-        # calculate actual data ranges for each window
-        window = rolling_window(inp, count)
-        data_min = np.min(window, 1)
-        data_max = np.max(window, 1)
-        data_range = np.abs(data_max - data_min)
+    return flag_arr.reshape(original_shape)
 
-        # find data ranges that are within threshold and flag them
-        test_results = np.ma.filled(data_range < tolerance, fill_value=False)
-        # data points before end of first window should pass
-        n_fill = min(len(inp), count)
-        test_results = np.insert(test_results, 0, np.full((n_fill,), False))
-        flag_arr[test_results] = flag_value
 
-    run_test(suspect_threshold, QartodFlags.SUSPECT)
-    run_test(fail_threshold, QartodFlags.FAIL)
+def _uniform_rolling_range(values, tinp, test_period, min_periods):
+    """Range over trailing ``test_period`` second windows of evenly spaced data.
 
-    # If the value is masked set the flag to MISSING
-    flag_arr[inp.mask] = QartodFlags.MISSING
+    Matches ``series.rolling(f"{test_period}s", min_periods).apply(np.ptp, raw=True)``
+    without a Python call per window. Returns None when ``tinp`` is not evenly
+    spaced so the caller can fall back to pandas.
+    """
+    dt = np.diff(tinp.astype("datetime64[ns]").astype(np.int64))
+    if dt.size == 0 or dt[0] <= 0 or np.any(dt != dt[0]):
+        return None
+    # The window (t - test_period, t] holds ceil(test_period / dt) samples
+    period = pd.Timedelta(f"{test_period}s").value
+    if period <= 0:
+        return None
+    window = int(-(-period // dt[0]))
+
+    missing = np.isnan(values)
+    # O(n) moving extremes. Windows longer than the data cover the same
+    # values as a window the length of the data.
+    window_len = min(window, values.size)
+    if bn is not None:
+        highs = bn.move_max(values, window_len, min_count=1)
+        lows = bn.move_min(values, window_len, min_count=1)
+    else:
+        # Trailing windows, padded before the start so partial windows only
+        # see real values. NaNs never set the extremes.
+        origin = (window_len - 1) // 2
+        highs = maximum_filter1d(
+            np.where(missing, -np.inf, values),
+            window_len,
+            mode="constant",
+            cval=-np.inf,
+            origin=origin,
+        )
+        lows = minimum_filter1d(
+            np.where(missing, np.inf, values),
+            window_len,
+            mode="constant",
+            cval=np.inf,
+            origin=origin,
+        )
+    with np.errstate(invalid="ignore"):
+        check_val = highs - lows
 
-    return flag_arr.reshape(original_shape)
+    # Like np.ptp, any missing value in a window makes its range NaN, and
+    # windows with fewer than min_periods valid values are not evaluated
+    end = np.arange(1, values.size + 1)
+    start = np.maximum(end - window, 0)
+    counts = np.concatenate([[0], np.cumsum(~missing)])
+    nvalid = counts[end] - counts[start]
+    check_val[nvalid < end - start] = np.nan
+    check_val[nvalid < (1 if min_periods is None else min_periods)] = np.nan
+    return check_val
+
+
+def _rolling_range(w):
+    # When pandas>=1.0 and numba are installed, this is about twice as fast
+    try:
+        return w.apply(np.ptp, raw=True, engine="numba")
+    except (ImportError, TypeError, NumbaTypeError):
+        return w.apply(np.ptp, raw=True)
+
+
+# check_type -> (window_func, check_func)
+# window_func: Applied to each window when `time_period` is supplied
+# check_func: Applied to a flattened numpy array when no `time_period` is supplied
+# These are split for performance reasons
+_attenuated_signal_checks = {
+    "std": (lambda w: w.std(), np.ma.std),
+    "range": (_rolling_range, np.ma.ptp),
+}
 
 
 @add_flag_metadata(
@@ -831,37 +1036,18 @@ def attenuated_signal_test(
         input data is flagged together.
 
     """
-    # window_func: Applied to each window when `time_period` is supplied
-    # check_func: Applied to a flattened numpy array when no `time_period` is supplied
-    # These are split for performance reasons
-    if check_type == "std":
-        window_func = lambda x: x.std()  # noqa
-        check_func = np.ma.std
-    elif check_type == "range":
-
-        def window_func(w):
-            # When pandas>=1.0 and numba are installed, this is about twice as fast
-            try:
-                return w.apply(np.ptp, raw=True, engine="numba")
-            except (ImportError, TypeError, NumbaTypeError):
-                return w.apply(np.ptp, raw=True)
-
-        check_func = np.ma.ptp
-    else:
+    try:
+        window_func, check_func = _attenuated_signal_checks[check_type]
+    except (KeyError, TypeError):
         msg = f'Check type "{check_type}" is not one of ["std", "range"]'
-        raise ValueError(msg)
+        raise ValueError(msg) from None
 
     tinp = mapdates(tinp)
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        inp = np.ma.masked_invalid(np.array(inp).astype(np.float64))
+    inp = np.ma.masked_invalid(to_float_array(inp))
 
     # Save original shape
     original_shape = inp.shape
 
-    # Start with everything as not tested (0)
-    flag_arr = np.full((inp.size,), QartodFlags.UNKNOWN)
-
     if test_period:
         if min_obs is not None:
             min_periods = min_obs
@@ -870,23 +1056,65 @@ def attenuated_signal_test(
             min_periods = (min_period / time_interval).astype(int)
         else:
             min_periods = None
-        series = pd.Series(inp.flatten(), index=tinp.flatten())
-        windows = series.rolling(f"{test_period}s", min_periods=min_periods)
-        check_val = window_func(windows)
+        check_val = None
+        if check_type == "range":
+            check_val = _uniform_rolling_range(
+                inp.flatten().filled(np.nan),
+                tinp.flatten(),
+                test_period,
+                min_periods,
+            )
+        if check_val is None:
+            series = pd.Series(inp.flatten(), index=tinp.flatten())
+            windows = series.rolling(f"{test_period}s", min_periods=min_periods)
+            check_val = window_func(windows)
     else:
         # applying np.ptp to Series causes warnings, this is a workaround
         series = inp.flatten()
-        check_val = np.ones_like(flag_arr) * check_func(series)
+        check_val = np.ones(inp.size) * check_func(series)
 
-    flag_arr[check_val >= suspect_threshold] = QartodFlags.GOOD
-    flag_arr[check_val < suspect_threshold] = QartodFlags.SUSPECT
-    flag_arr[np.isnan(check_val)] = QartodFlags.UNKNOWN
-    flag_arr[check_val < fail_threshold] = QartodFlags.FAIL
-    flag_arr[inp.mask] = QartodFlags.MISSING
+    # Values that could not be checked (NaN) stay UNKNOWN unless masked
+    check_val = np.ma.filled(check_val, np.nan).astype(np.float64)
+    with np.errstate(invalid="ignore"):
+        flag_arr = _select_flags(
+            [
+                np.ma.getmaskarray(inp).flatten(),
+                check_val < fail_threshold,
+                np.isnan(check_val),
+                check_val < suspect_threshold,
+            ],
+            [QartodFlags.MISSING, QartodFlags.FAIL, QartodFlags.UNKNOWN, QartodFlags.SUSPECT],
+        )
 
     return flag_arr.reshape(original_shape)
 
 
+def _density_inversion_kernel(rho, z, suspect_threshold, fail_threshold, marks):
+    """Mark density inversions and missing records in a single pass.
+
+    ``marks`` holds the suspect, fail and missing rows. An inversion below a
+    threshold marks the records on both sides of it, and a missing density or
+    depth marks its own record and the following one.
+    """
+    suspect, fail, missing = marks[0], marks[1], marks[2]
+    n = rho.size
+    for i in range(n):
+        if np.isnan(rho[i]) or np.isnan(z[i]):
+            missing[i] = True
+            if i + 1 < n:
+                missing[i + 1] = True
+        if i + 1 < n:
+            delta = np.sign(z[i + 1] - z[i]) * (rho[i + 1] - rho[i])
+            if delta < suspect_threshold:
+                suspect[i] = suspect[i + 1] = True
+            if delta < fail_threshold:
+                fail[i] = fail[i + 1] = True
+
+
+if njit is not None:
+    _density_inversion_kernel = njit(cache=True)(_density_inversion_kernel)
+
+
 @add_flag_metadata(
     standard_name="density_inversion_test_flag",
     long_name="Density Inversion Test Flag",
@@ -926,10 +1154,8 @@ def density_inversion_test(
         A masked array of flag values equal in size to that of the input.
 
     """
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        inp = np.ma.masked_invalid(np.array(inp).astype(np.float64))
-        zinp = np.ma.masked_invalid(np.array(zinp).astype(np.float64))
+    inp = np.ma.masked_invalid(to_float_array(inp))
+    zinp = np.ma.masked_invalid(to_float_array(zinp))
 
     # Make sure both inputs are the same size.
     if inp.shape != zinp.shape:
@@ -937,7 +1163,7 @@ def density_inversion_test(
         raise ValueError(msg)
 
     # Start with everything as passing
-    flag_arr = QartodFlags.GOOD * np.ma.ones(inp.size, dtype="uint8")
+    flag_arr = np.ma.ones(inp.size, dtype="uint8")
 
     # If no data or just one record, return respectively an empty mask array or UNKNOWN
     if inp.size == 0:
@@ -946,25 +1172,44 @@ def density_inversion_test(
         flag_arr[0] = QartodFlags.UNKNOWN
         return flag_arr
 
-    # Compute the vertical density variability along zinp and flip delta according to zinp variation direction
-    delta = np.sign(np.diff(zinp)) * np.diff(inp)
-
-    if suspect_threshold is not None:
+    # Non-numeric thresholds take the numpy path, which raises the TypeError
+    thresholds = (suspect_threshold, fail_threshold)
+    if njit is not None and all(t is None or isinstance(t, N) for t in thresholds):
+        marks = np.zeros((3, inp.size), dtype=bool)
+        _density_inversion_kernel(
+            inp.filled(np.nan),
+            zinp.filled(np.nan),
+            -np.inf if suspect_threshold is None else float(suspect_threshold),
+            -np.inf if fail_threshold is None else float(fail_threshold),
+            marks,
+        )
+        is_suspect, is_fail, is_missing = marks
+    else:
+        # Compute the vertical density variability along zinp and flip delta
+        # according to zinp variation direction
+        delta = np.ma.filled(np.sign(np.diff(zinp)) * np.diff(inp), np.nan)
+
+        def both_sides(is_flagged):
+            # An inversion flags both the previous and the reversed value
+            points = np.zeros(inp.size, dtype=bool)
+            points[:-1] |= is_flagged
+            points[1:] |= is_flagged
+            return points
+
+        no_flags = np.zeros(inp.size, dtype=bool)
         with np.errstate(invalid="ignore"):
-            is_suspect = delta < suspect_threshold
-            if any(is_suspect):
-                flag_arr[:-1][is_suspect == True] = QartodFlags.SUSPECT  # noqa:E712- Previous value
-                flag_arr[1:][is_suspect == True] = QartodFlags.SUSPECT  # noqa:E712- Reversed value
+            is_suspect = (
+                no_flags if suspect_threshold is None else both_sides(delta < suspect_threshold)
+            )
+            is_fail = no_flags if fail_threshold is None else both_sides(delta < fail_threshold)
 
-    if fail_threshold is not None:
-        with np.errstate(invalid="ignore"):
-            is_fail = delta < fail_threshold
-            if any(is_fail):
-                flag_arr[:-1][is_fail == True] = QartodFlags.FAIL  # noqa:E712- Previous value
-                flag_arr[1:][is_fail == True] = QartodFlags.FAIL  # noqa:E712- Reversed Value
-
-    # If the value or depth is masked set the flag to MISSING for this record and the following one.
-    is_missing = inp.mask | zinp.mask
-    flag_arr[is_missing] = QartodFlags.MISSING
-    flag_arr[1:][is_missing[:-1]] = QartodFlags.MISSING
-    return flag_arr
+        # If the value or depth is masked set the flag to MISSING for this
+        # record and the following one.
+        is_missing = np.ma.getmaskarray(inp) | np.ma.getmaskarray(zinp)
+        is_missing[1:] |= is_missing[:-1].copy()
+
+    flag_arr = _select_flags(
+        [is_missing, is_fail, is_suspect],
+        [QartodFlags.MISSING, QartodFlags.FAIL, QartodFlags.SUSPECT],
+    )
+    return np.ma.masked_array(flag_arr)
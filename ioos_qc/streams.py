@@ -84,6 +84,14 @@ class PandasStream:
         return self.df[stream_id]
 
     def run(self, config: Config):  # noqa: C901, PLR0912
+        # Sorted times let each window be found by bisection and taken as a
+        # slice, rather than comparing every time against the window edges
+        sorted_times = None
+        if self.time_column in self.axis_columns:
+            times = self.df[self.time_column]
+            if times.is_monotonic_increasing:
+                sorted_times = times
+
         for context, calls in config.contexts.items():
             # Subset first by the stream id in each call
             stream_ids = []
@@ -103,8 +111,21 @@ class PandasStream:
                 # lon_column attributes in the constructor.
                 pass
 
+            # This is a boolean array of what was subset and tested based on
+            # the initial data feed.
+            subset_indexes = None
+
             if context.window.starting is not None or context.window.ending is not None:
-                if self.time_column in self.axis_columns:
+                if sorted_times is not None:
+                    start, end = 0, len(subset)
+                    if context.window.starting:
+                        start = sorted_times.searchsorted(context.window.starting, side="left")
+                    if context.window.ending:
+                        end = sorted_times.searchsorted(context.window.ending, side="left")
+                    subset = subset.iloc[start:end]
+                    subset_indexes = np.zeros(len(self.df), dtype="bool")
+                    subset_indexes[start:end] = True
+                elif self.time_column in self.axis_columns:
                     if context.window.starting:
                         subset = subset.loc[
                             subset[self.time_column] >= context.window.starting,
@@ -120,11 +141,11 @@ class PandasStream:
                         f"Skipping window subset, {self.time_column} not in columns",
                     )
 
-            # This is a boolean array of what was subset and tested based on
-            # the initial data feed. Take the index of the subset and set
-            # those to true.
-            subset_indexes = pd.Series(0, index=self.df.index, dtype="bool")
-            subset_indexes.iloc[subset.index] = True
+            if subset_indexes is None:
+                # Take the index of the subset and set those to true.
+                subset_indexes = pd.Series(0, index=self.df.index, dtype="bool")
+                subset_indexes.iloc[subset.index] = True
+                subset_indexes = subset_indexes.to_numpy()
 
             # The source is subset, now the resulting rows need to be tested
             # Put together the static inputs that were subset for this config
@@ -159,7 +180,7 @@ class PandasStream:
                 yield ContextResult(
                     results=run_result,
                     stream_id=call.stream_id,
-                    subset_indexes=subset_indexes.to_numpy(),
+                    subset_indexes=subset_indexes,
                     data=data_input.to_numpy(),
                     tinp=subset_kwargs.get(
                         "tinp",
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import copy
+import functools
 import io
 import json
 import logging
+import math
+import warnings
 from collections import OrderedDict
 from collections.abc import Mapping
 from datetime import date, datetime
@@ -19,6 +23,11 @@ import xarray as xr
 from geographiclib.geodesic import Geodesic
 from ruamel.yaml import YAML
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 N = Real
 L = logging.getLogger(__name__)
 
@@ -99,6 +108,15 @@ def load_config_from_xarray(source):
     return y
 
 
+@functools.lru_cache(maxsize=64)
+def _load_yaml_text(text: str) -> Any:
+    """Parse YAML text, caching the result so the same config is only parsed once.
+
+    Callers must copy the result before handing it out, it is shared between calls.
+    """
+    return YAML(typ="safe").load(text)
+
+
 def load_config_as_dict(
     source: str | dict | OrderedDict | Path | io.StringIO,
 ) -> OrderedDict:
@@ -107,7 +125,6 @@ def load_config_as_dict(
     JSON file.
 
     """
-    yaml = YAML(typ="safe")
     if isinstance(source, OrderedDict):
         return source
     if isinstance(source, dict):
@@ -117,12 +134,13 @@ def load_config_as_dict(
     if isinstance(source, (str, Path)):
         source = str(source)
 
-        # Try to load as YAML, then JSON, then file path
+        # Try to load as YAML, then JSON, then file path. Only the YAML text is
+        # cached, files are read every time in case they have changed.
         load_funcs = [
-            lambda x: OrderedDict(yaml.load(x)),
+            lambda x: OrderedDict(copy.deepcopy(_load_yaml_text(x))),
             lambda x: OrderedDict(json.loads(x)),
             lambda x: load_config_from_xarray(x),
-            lambda x: OrderedDict(yaml.load(openf(x))),
+            lambda x: OrderedDict(YAML(typ="safe").load(openf(x))),
             lambda x: OrderedDict(json.loads(openf(x))),
         ]
         for lf in load_funcs:
@@ -134,7 +152,7 @@ def load_config_as_dict(
     elif isinstance(source, io.StringIO):
         # Try to load as YAML, then JSON, then file path
         load_funcs = [
-            lambda x: OrderedDict(yaml.load(x)),
+            lambda x: OrderedDict(YAML(typ="safe").load(x)),
             lambda x: OrderedDict(json.load(x)),
         ]
         for lf in load_funcs:
@@ -170,17 +188,39 @@ def isnan(v: Any) -> bool:
     return v is None or v is np.nan or v is np.ma.masked
 
 
+def to_float_array(values) -> np.ndarray:
+    """Convert values to a float64 array, with NaN wherever a value is missing.
+
+    numpy converts None and np.ma.masked to NaN when casting to float64, and
+    masked arrays have their masked values filled with NaN. Values numpy cannot
+    cast raise its usual TypeError or ValueError.
+    """
+    if isinstance(values, np.ma.MaskedArray):
+        return values.astype(np.float64).filled(np.nan)
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore",
+            message="Warning: converting a masked element to nan",
+            category=UserWarning,
+        )
+        return np.asarray(values, dtype=np.float64)
+
+
 def mapdates(dates):
-    """Map dates objects to datetime64[ns]."""
+    """Map dates objects to datetime64[ns].
+
+    Inputs that are already datetime64[ns] are returned without a copy, so
+    callers must not modify the result in place.
+    """
     if hasattr(dates, "dtype") and hasattr(dates.dtype, "tz"):
         # pandas time objects with a datetime component, remove the timezone
         return dates.dt.tz_localize(None).astype("datetime64[ns]").to_numpy()
     if hasattr(dates, "dtype") and hasattr(dates, "to_numpy"):
         # pandas time objects without a datetime component
-        return dates.to_numpy().astype("datetime64[ns]")
+        return dates.to_numpy().astype("datetime64[ns]", copy=False)
     if hasattr(dates, "dtype") and np.issubdtype(dates.dtype, np.datetime64):
         # numpy datetime objects
-        return dates.astype("datetime64[ns]")
+        return dates.astype("datetime64[ns]", copy=False)
     try:
         # Finally try unix epoch seconds
         return (
@@ -195,6 +235,10 @@ def mapdates(dates):
         return np.array(dates, dtype="datetime64[ns]")
 
 
+# Number of timestamp differences check_timestamps computes at a time
+_TIMESTAMP_BLOCK = 65536
+
+
 def check_timestamps(
     times: np.ndarray,
     max_time_interval: N = None,
@@ -216,17 +260,22 @@ def check_timestamps(
         The interval between values should not exceed this value. [optional]
 
     """
-    time_diff = np.diff(times)
-    sort_diff = np.diff(sorted(times))
-    # Check if there are differences between sorted and unsorted, and then
-    # see if if there are any duplicate times.  Then check that none of the
-    # diffs exceeds the sorted time.
-    zero = np.array(0, dtype=time_diff.dtype)
-    return not (
-        not np.array_equal(time_diff, sort_diff)
-        or np.any(sort_diff == zero)
-        or (max_time_interval is not None and np.any(sort_diff > max_time_interval))
-    )
+    times = np.asarray(times)
+    # Times are sorted without duplicates exactly when every difference is
+    # positive, so there is no need to sort a copy. The differences are taken
+    # a block at a time, overlapping by one value, so an out of order or
+    # repeated prefix is found without scanning the rest of the series.
+    for start in range(0, times.size - 1, _TIMESTAMP_BLOCK):
+        time_diff = np.diff(times[start : start + _TIMESTAMP_BLOCK + 1])
+        # A zero of the same type as the differences, which may be timedelta64,
+        # numbers or datetime.timedelta objects
+        zero = time_diff[0] - time_diff[0]
+        if not np.all(time_diff > zero):
+            return False
+        # Then check that none of the diffs exceeds the max interval
+        if max_time_interval is not None and np.any(time_diff > max_time_interval):
+            return False
+    return True
 
 
 def dict_update(d: Mapping, u: Mapping) -> Mapping:
@@ -285,13 +334,123 @@ class GeoNumpyDateEncoder(geojson.GeoJSONEncoder):
         return geojson.factory.GeoJSON.to_instance(obj)
 
 
-def great_circle_distance(lat_arr, lon_arr):
-    """Compute great circle distances."""
+# Plain floats, so the numba kernel can read them as constants
+_WGS84_A = float(Geodesic.WGS84.a)
+_WGS84_F = float(Geodesic.WGS84.f)
+# Change in longitude on the auxiliary sphere, in radians, at which Vincenty's iteration stops
+_VINCENTY_TOLERANCE = 1e-12
+
+
+def _geodesic_kernel(lat, lon, dist, unresolved):
+    """Set ``dist[i]`` to the WGS84 distance between points ``i - 1`` and ``i``.
 
-    def gc(y1, x1, y2, x2):
-        return Geodesic.WGS84.Inverse(y1, x1, y2, x2)["s12"]
+    Uses Vincenty's inverse formula, which agrees with geographiclib to well
+    under a millimetre. Nearly antipodal pairs, where the iteration does not
+    converge, are marked in ``unresolved`` for the caller to compute.
+    """
+    a = _WGS84_A
+    f = _WGS84_F
+    b = (1 - f) * a
+    for i in range(1, lat.size):
+        if np.isnan(lat[i - 1]) or np.isnan(lon[i - 1]) or np.isnan(lat[i]) or np.isnan(lon[i]):
+            dist[i] = np.nan
+            continue
+
+        big_l = math.radians(lon[i] - lon[i - 1])
+        u1 = math.atan((1 - f) * math.tan(math.radians(lat[i - 1])))
+        u2 = math.atan((1 - f) * math.tan(math.radians(lat[i])))
+        sin_u1, cos_u1 = math.sin(u1), math.cos(u1)
+        sin_u2, cos_u2 = math.sin(u2), math.cos(u2)
+
+        lam = big_l
+        converged = False
+        sin_sigma = cos_sigma = sigma = cos2_alpha = cos_2sigma_m = 0.0
+        for _ in range(200):
+            sin_lam, cos_lam = math.sin(lam), math.cos(lam)
+            sin_sigma = math.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+            if sin_sigma == 0:
+                # Coincident points
+                converged = True
+                break
+            cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+            sigma = math.atan2(sin_sigma, cos_sigma)
+            sin_alpha = cos_u1 * cos_u2 * sin_lam / sin_sigma
+            cos2_alpha = 1 - sin_alpha * sin_alpha
+            # Both points on the equator
+            cos_2sigma_m = cos_sigma - 2 * sin_u1 * sin_u2 / cos2_alpha if cos2_alpha else 0.0
+            c = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+            lam_prev = lam
+            lam = big_l + (1 - c) * f * sin_alpha * (
+                sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (2 * cos_2sigma_m**2 - 1))
+            )
+            if abs(lam - lam_prev) < _VINCENTY_TOLERANCE:
+                converged = True
+                break
+
+        if not converged:
+            unresolved[i] = True
+        elif sin_sigma == 0:
+            dist[i] = 0.0
+        else:
+            u_sq = cos2_alpha * (a * a - b * b) / (b * b)
+            big_a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+            big_b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+            delta_sigma = (
+                big_b
+                * sin_sigma
+                * (
+                    cos_2sigma_m
+                    + big_b
+                    / 4
+                    * (
+                        cos_sigma * (2 * cos_2sigma_m**2 - 1)
+                        - big_b
+                        / 6
+                        * cos_2sigma_m
+                        * (4 * sin_sigma**2 - 3)
+                        * (4 * cos_2sigma_m**2 - 3)
+                    )
+                )
+            )
+            dist[i] = b * big_a * (sigma - delta_sigma)
 
+
+if njit is not None:
+    _geodesic_kernel = njit(cache=True)(_geodesic_kernel)
+
+
+def great_circle_distance(lat_arr, lon_arr):
+    """Compute great circle distances.
+
+    Distances between masked points are masked. When numba is installed the
+    distances come from a compiled kernel that agrees with geographiclib to
+    well under a millimetre.
+    """
     dist = np.ma.zeros(lon_arr.size, dtype=np.float64)
-    dv = np.vectorize(gc)
-    dist[1:] = dv(lat_arr[:-1], lon_arr[:-1], lat_arr[1:], lon_arr[1:])
+    lats = np.ma.getdata(lat_arr).astype(np.float64).ravel()
+    lons = np.ma.getdata(lon_arr).astype(np.float64).ravel()
+
+    def inverse(i):
+        y1, x1, y2, x2 = (float(v) for v in (lats[i - 1], lons[i - 1], lats[i], lons[i]))
+        return Geodesic.WGS84.Inverse(y1, x1, y2, x2, Geodesic.DISTANCE)["s12"]
+
+    if njit is not None:
+        out = np.zeros(lats.size, dtype=np.float64)
+        unresolved = np.zeros(lats.size, dtype=bool)
+        _geodesic_kernel(lats, lons, out, unresolved)
+        for i in np.flatnonzero(unresolved):
+            out[i] = inverse(i)
+        dist[:] = out
+    else:
+        # Only ask for the distance, and iterate over plain floats rather than
+        # through np.vectorize
+        dist[1:] = np.fromiter(
+            (inverse(i) for i in range(1, lats.size)),
+            dtype=np.float64,
+            count=max(lats.size - 1, 0),
+        )
+
+    missing = np.ma.getmaskarray(lat_arr) | np.ma.getmaskarray(lon_arr)
+    if missing.any():
+        dist[np.concatenate([[False], missing[:-1] | missing[1:]])] = np.ma.masked
     return dist
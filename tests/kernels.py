@@ -0,0 +1,6 @@
+"""Helpers for testing the kernels numba compiles when it is installed."""
+
+
+def python_kernel(kernel):
+    """Return the pure Python form of ``kernel``, whether or not numba compiled it."""
+    return getattr(kernel, "py_func", kernel)
@@ -14,16 +14,19 @@ L.addHandler(logging.StreamHandler())
 
 
 class ArgoSpeedTest(unittest.TestCase):
-    def setUp(self):
-        self.times = np.arange(
+    @classmethod
+    def setUpClass(cls):
+        cls.times = np.arange(
             "2015-01-01 00:00:00",
             "2015-01-01 06:00:00",
             step=np.timedelta64(1, "h"),
             dtype=np.datetime64,
         )
-        self.times_epoch_secs = [t.astype(int) for t in self.times]
-        self.suspect_threshold = 1  # 1 m/s or 0.06 km/min or  3.6 km/hr
-        self.fail_threshold = 3  # 3 m/s or 0.18 km/min or 10.8 km/hr
+        cls.times_epoch_secs = cls.times.astype("datetime64[s]").astype(np.int64)
+        cls.times.setflags(write=False)
+        cls.times_epoch_secs.setflags(write=False)
+        cls.suspect_threshold = 1  # 1 m/s or 0.06 km/min or  3.6 km/hr
+        cls.fail_threshold = 3  # 3 m/s or 0.18 km/min or 10.8 km/hr
 
     def test_speed_test(self):
         """Happy path: some pass, fail and suspect."""
@@ -40,7 +43,7 @@ class ArgoSpeedTest(unittest.TestCase):
                 suspect_threshold=self.suspect_threshold,
                 fail_threshold=self.fail_threshold,
             ),
-            np.array([2, 1, 1, 1, 1, 1]),
+            np.array([2, 1, 1, 1, 1, 1], dtype=np.int8),
         )
 
         # some fail and suspect
@@ -54,7 +57,7 @@ class ArgoSpeedTest(unittest.TestCase):
                 suspect_threshold=self.suspect_threshold,
                 fail_threshold=self.fail_threshold,
             ),
-            np.array([2, 1, 3, 4, 4, 1]),
+            np.array([2, 1, 3, 4, 4, 1], dtype=np.int8),
         )
 
     def test_speed_test_edge_cases(self):
@@ -82,7 +85,7 @@ class ArgoSpeedTest(unittest.TestCase):
                 suspect_threshold=self.suspect_threshold,
                 fail_threshold=self.fail_threshold,
             ),
-            np.array([2]),
+            np.array([2], dtype=np.int8),
         )
 
         # size 2 arr
@@ -97,7 +100,7 @@ class ArgoSpeedTest(unittest.TestCase):
                 suspect_threshold=self.suspect_threshold,
                 fail_threshold=self.fail_threshold,
             ),
-            np.array([2, 1]),
+            np.array([2, 1], dtype=np.int8),
         )
 
     def test_speed_test_error_scenario(self):
@@ -137,7 +140,7 @@ class ArgoPressureIncreasingTest(unittest.TestCase):
             dtype="float32",
         )
         flags = argo.pressure_increasing_test(pressure)
-        npt.assert_array_equal(flags, np.array([1, 1, 1, 1, 1, 1, 1, 1]))
+        npt.assert_array_equal(flags, np.array([1, 1, 1, 1, 1, 1, 1, 1], dtype=np.int8))
 
     def test_pressure_upcast(self):
         # Standard upcast
@@ -147,7 +150,7 @@ class ArgoPressureIncreasingTest(unittest.TestCase):
         )
         pressure = pressure[::-1]
         flags = argo.pressure_increasing_test(pressure)
-        npt.assert_array_equal(flags, np.array([1, 1, 1, 1, 1, 1, 1, 1]))
+        npt.assert_array_equal(flags, np.array([1, 1, 1, 1, 1, 1, 1, 1], dtype=np.int8))
 
     def test_pressure_shallow(self):
         # Shallow profiles should be flagged if it's stuck or decreasing
@@ -156,7 +159,7 @@ class ArgoPressureIncreasingTest(unittest.TestCase):
             dtype="float32",
         )
         flags = argo.pressure_increasing_test(pressure)
-        npt.assert_array_equal(flags, np.array([1, 1, 3, 3, 1, 1, 3, 1]))
+        npt.assert_array_equal(flags, np.array([1, 1, 3, 3, 1, 1, 3, 1], dtype=np.int8))
 
     def test_using_config(self):
         config = {
@@ -173,7 +176,7 @@ class ArgoPressureIncreasingTest(unittest.TestCase):
             ),
         )
 
-        expected = np.array([1, 1, 3, 3, 1, 1, 3, 1])
+        expected = np.array([1, 1, 3, 3, 1, 1, 3, 1], dtype=np.int8)
         npt.assert_array_equal(
             r["argo"]["pressure_increasing_test"],
             expected,
@@ -183,4 +186,4 @@ class ArgoPressureIncreasingTest(unittest.TestCase):
         # Deprecated method should still work
         pressure = np.array([0.0, 2.0, 3.0], dtype="float32")
         flags = gliders.pressure_check(pressure)
-        npt.assert_array_equal(flags, np.array([1, 1, 1]))
+        npt.assert_array_equal(flags, np.array([1, 1, 1], dtype=np.int8))
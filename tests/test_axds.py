@@ -18,13 +18,15 @@ L.addHandler(logging.StreamHandler())
 
 
 class AxdsValidTimeBoundsTest(unittest.TestCase):
-    def setUp(self):
-        self.times = np.arange(
+    @classmethod
+    def setUpClass(cls):
+        cls.times = np.arange(
             "2015-01-01 00:00:00",
             "2015-01-01 06:00:00",
             step=np.timedelta64(1, "h"),
             dtype=np.datetime64,
         )
+        cls.times.setflags(write=False)
 
     def test_no_bounds(self):
         valid_spans = [
@@ -44,7 +46,7 @@ class AxdsValidTimeBoundsTest(unittest.TestCase):
                     self.times,
                     valid_span=valid_span,
                 ),
-                np.array([1, 1, 1, 1, 1, 1]),
+                np.array([1, 1, 1, 1, 1, 1], dtype=np.int8),
             )
 
     def test_chop_start(self):
@@ -65,7 +67,7 @@ class AxdsValidTimeBoundsTest(unittest.TestCase):
                     self.times,
                     valid_span=valid_span,
                 ),
-                np.array([4, 4, 1, 1, 1, 1]),
+                np.array([4, 4, 1, 1, 1, 1], dtype=np.int8),
             )
 
     def test_chop_end(self):
@@ -86,7 +88,7 @@ class AxdsValidTimeBoundsTest(unittest.TestCase):
                     self.times,
                     valid_span=valid_span,
                 ),
-                np.array([1, 1, 1, 1, 4, 4]),
+                np.array([1, 1, 1, 1, 4, 4], dtype=np.int8),
             )
 
     def test_chop_ends(self):
@@ -107,7 +109,7 @@ class AxdsValidTimeBoundsTest(unittest.TestCase):
                     self.times,
                     valid_span=valid_span,
                 ),
-                np.array([4, 4, 1, 1, 4, 4]),
+                np.array([4, 4, 1, 1, 4, 4], dtype=np.int8),
             )
 
     def test_chop_all(self):
@@ -128,7 +130,7 @@ class AxdsValidTimeBoundsTest(unittest.TestCase):
                     self.times,
                     valid_span=valid_span,
                 ),
-                np.array([4, 4, 4, 4, 4, 4]),
+                np.array([4, 4, 4, 4, 4, 4], dtype=np.int8),
             )
 
     def test_empty_chop_ends(self):
@@ -150,7 +152,7 @@ class AxdsValidTimeBoundsTest(unittest.TestCase):
                 times,
                 valid_span=valid_span,
             ),
-            np.array([9, 9, 1, 1, 4, 4]),
+            np.array([9, 9, 1, 1, 4, 4], dtype=np.int8),
         )
 
     def test_all_empty(self):
@@ -172,7 +174,7 @@ class AxdsValidTimeBoundsTest(unittest.TestCase):
                 times,
                 valid_span=valid_span,
             ),
-            np.array([9, 9, 9, 9, 9, 9]),
+            np.array([9, 9, 9, 9, 9, 9], dtype=np.int8),
         )
 
     def test_inclusive_exclusive(self):
@@ -193,7 +195,7 @@ class AxdsValidTimeBoundsTest(unittest.TestCase):
                     self.times,
                     valid_span=valid_span,
                 ),
-                np.array([4, 4, 1, 1, 4, 4]),
+                np.array([4, 4, 1, 1, 4, 4], dtype=np.int8),
             )
 
         for valid_span in valid_spans:
@@ -204,7 +206,7 @@ class AxdsValidTimeBoundsTest(unittest.TestCase):
                     start_inclusive=True,
                     end_inclusive=False,
                 ),
-                np.array([4, 4, 1, 1, 4, 4]),
+                np.array([4, 4, 1, 1, 4, 4], dtype=np.int8),
             )
 
         for valid_span in valid_spans:
@@ -215,7 +217,7 @@ class AxdsValidTimeBoundsTest(unittest.TestCase):
                     start_inclusive=True,
                     end_inclusive=True,
                 ),
-                np.array([4, 4, 1, 1, 1, 4]),
+                np.array([4, 4, 1, 1, 1, 4], dtype=np.int8),
             )
 
         for valid_span in valid_spans:
@@ -226,7 +228,7 @@ class AxdsValidTimeBoundsTest(unittest.TestCase):
                     start_inclusive=False,
                     end_inclusive=True,
                 ),
-                np.array([4, 4, 4, 1, 1, 4]),
+                np.array([4, 4, 4, 1, 1, 4], dtype=np.int8),
             )
 
         for valid_span in valid_spans:
@@ -237,7 +239,7 @@ class AxdsValidTimeBoundsTest(unittest.TestCase):
                     start_inclusive=False,
                     end_inclusive=False,
                 ),
-                np.array([4, 4, 4, 1, 4, 4]),
+                np.array([4, 4, 4, 1, 4, 4], dtype=np.int8),
             )
 
     def test_with_config(self):
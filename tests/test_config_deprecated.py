@@ -114,7 +114,7 @@ class ConfigRunTest(unittest.TestCase):
             inp=list(range(13)),
         )
 
-        expected = np.array([3, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 3])
+        expected = np.array([3, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 3], dtype=np.int8)
         npt.assert_array_equal(
             r["qartod"]["gross_range_test"],
             expected,
@@ -136,8 +136,8 @@ class ConfigRunTest(unittest.TestCase):
             },
         )
         inp = [-1, 0, 1, 2, 10, 3]
-        expected_gross_range = np.array([4, 1, 1, 1, 1, 1])
-        expected_spike = np.array([2, 1, 1, 3, 3, 2])
+        expected_gross_range = np.array([4, 1, 1, 1, 1, 1], dtype=np.int8)
+        expected_spike = np.array([2, 1, 1, 3, 3, 2], dtype=np.int8)
 
         r = qc.run(
             inp=inp,
@@ -164,12 +164,12 @@ class ConfigRunTest(unittest.TestCase):
             lon=xs,
         )
 
-        range_expected = np.array([3, 1, 1, 1, 1, 1, 1])
+        range_expected = np.array([3, 1, 1, 1, 1, 1, 1], dtype=np.int8)
         npt.assert_array_equal(
             r["qartod"]["gross_range_test"],
             range_expected,
         )
-        location_expected = np.array([4, 1, 1, 1, 1, 1, 4])
+        location_expected = np.array([4, 1, 1, 1, 1, 1, 4], dtype=np.int8)
         npt.assert_array_equal(
             r["qartod"]["location_test"],
             location_expected,
@@ -187,12 +187,12 @@ class ConfigRunTest(unittest.TestCase):
         qc = QcConfig(config)
         r = qc.run()
 
-        range_expected = np.array([3, 1, 1, 1, 1, 1, 1])
+        range_expected = np.array([3, 1, 1, 1, 1, 1, 1], dtype=np.int8)
         npt.assert_array_equal(
             r["qartod"]["gross_range_test"],
             range_expected,
         )
-        location_expected = np.array([4, 1, 1, 1, 1, 1, 4])
+        location_expected = np.array([4, 1, 1, 1, 1, 1, 4], dtype=np.int8)
         npt.assert_array_equal(
             r["qartod"]["location_test"],
             location_expected,
@@ -1,5 +1,10 @@
+import functools
 import logging
+import timeit
 import unittest
+from unittest import mock
+
+import numpy as np
 
 from ioos_qc import qartod
 from ioos_qc.config import QcConfig
@@ -10,18 +15,24 @@ L.handlers = [logging.StreamHandler()]
 
 
 class PerformanceTest(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         from pathlib import Path
 
         import pandas as pd
 
-        data = pd.read_csv(Path(__file__).parent / "data/20363_1000427.csv.gz")
-        self.times = data["time_epoch"]
-        self.inp = data["value"]
-        self.zinp = data["depth"]
-        self.lon = data["longitude"]
-        self.lat = data["latitude"]
-        self.n = 10
+        # Read the data once, every test only reads from it. Converting to
+        # ndarrays here keeps the Series conversion out of the timed runs.
+        data = pd.read_csv(
+            Path(__file__).parent / "data/20363_1000427.csv.gz",
+            usecols=["time_epoch", "value", "depth", "longitude", "latitude"],
+        )
+        cls.times = data["time_epoch"].to_numpy(dtype=np.int64)
+        cls.inp = data["value"].to_numpy(dtype=np.float64)
+        cls.zinp = data["depth"].to_numpy(dtype=np.float64)
+        cls.lon = data["longitude"].to_numpy(dtype=np.float64)
+        cls.lat = data["latitude"].to_numpy(dtype=np.float64)
+        cls.n = 10
 
     def perf_test(self, qc, method_name=None, run_fn=None):
         if method_name is None and "argo" in qc.config:
@@ -29,28 +40,19 @@ class PerformanceTest(unittest.TestCase):
         if method_name is None:
             method_name = next(iter(qc.config["qartod"]))
         if run_fn is None:
-
-            def run_fn():
-                qc.run(
-                    inp=self.inp,
-                    tinp=self.times,
-                    zinp=self.zinp,
-                )
-
-        import time
-
-        start = time.time()
+            run_fn = functools.partial(qc.run, inp=self.inp, tinp=self.times, zinp=self.zinp)
 
         L.debug(f"running {method_name}...")
-        for i in range(self.n):
-            L.debug(f"\t{i + 1}/{self.n}")
-            run_fn()
+        # One untimed run first so numba compilation and first-call caches are
+        # not counted, then time each run on its own with the collector off
+        run_fn()
+        timings = timeit.repeat(run_fn, number=1, repeat=self.n)
 
-        end = time.time()
-        elapsed = end - start
+        elapsed = sum(timings)
         avg_elapsed = elapsed / self.n
         L.info(
-            f"results for {method_name}:\t\t{self.n} runs\n\t{elapsed}s total\n\t{avg_elapsed}s avg",
+            f"results for {method_name}:\t\t{self.n} runs\n\t{elapsed}s total\n\t{avg_elapsed}s avg"
+            f"\n\t{min(timings)}s best",
         )
 
     def test_location_test(self):
@@ -119,6 +121,17 @@ class PerformanceTest(unittest.TestCase):
         )
         self.perf_test(qc)
 
+    def test_gross_range__large(self):
+        # 10M float32 values, the check is one pass of boolean mask writes
+        inp = np.random.default_rng(0).uniform(-5, 15, 10_000_000).astype(np.float32)
+        run_fn = functools.partial(
+            qartod.gross_range_test,
+            inp=inp,
+            fail_span=(0, 12),
+            suspect_span=(1, 11),
+        )
+        self.perf_test(None, method_name="gross_range_test (10M points)", run_fn=run_fn)
+
     def test_climatology_test(self):
         qc = QcConfig(
             {
@@ -137,6 +150,34 @@ class PerformanceTest(unittest.TestCase):
         )
         self.perf_test(qc)
 
+    def test_climatology_test__large(self):
+        # 100k hourly rows passed as typed column arrays, checked against a year
+        # of daily windows
+        start = np.datetime64("2020-01-01", "s")
+        days = np.arange(366)
+        config = qartod.ClimatologyConfig()
+        for d in days:
+            config.add(
+                tspan=(
+                    start + np.timedelta64(d, "D"),
+                    start + np.timedelta64(d * 86400 + 86399, "s"),
+                ),
+                vspan=(10, 20),
+            )
+
+        rows = 100_000
+        tinp = start + np.arange(rows).astype("timedelta64[h]")
+        inp = np.linspace(0, 30, rows, dtype=np.float64)
+        zinp = np.full(rows, np.nan, dtype=np.float64)
+        run_fn = functools.partial(
+            qartod.climatology_test,
+            config=config,
+            inp=inp,
+            tinp=tinp,
+            zinp=zinp,
+        )
+        self.perf_test(None, method_name="climatology_test (100k rows)", run_fn=run_fn)
+
     def test_spike_test(self):
         qc = QcConfig(
             {
@@ -176,6 +217,46 @@ class PerformanceTest(unittest.TestCase):
         )
         self.perf_test(qc)
 
+    def _run_large(self, method_name, test_fn, **kwargs):
+        # 1M points so regressions in the per point work dominate the timing
+        arr = np.tile([1, 1, 1, 1, 1, 6, 5, 4, 3, 2], 100_000)
+        tinp = np.arange(arr.size)
+        self.perf_test(
+            None,
+            method_name=f"{method_name} (1M points)",
+            run_fn=functools.partial(test_fn, inp=arr, tinp=tinp, **kwargs),
+        )
+
+    def test_flat_line_test__large(self):
+        self._run_large(
+            "flat_line_test",
+            qartod.flat_line_test,
+            suspect_threshold=3,
+            fail_threshold=6,
+            tolerance=4,
+        )
+
+    def test_flat_line_test__large_without_numba(self):
+        # Times the scipy filter fallback against the numba kernel timed above
+        with mock.patch.object(qartod, "njit", None):
+            self._run_large(
+                "flat_line_test without numba",
+                qartod.flat_line_test,
+                suspect_threshold=3,
+                fail_threshold=6,
+                tolerance=4,
+            )
+
+    def test_spike_test__large(self):
+        def spike_test(inp, **_):
+            # spike_test has no time input
+            qartod.spike_test(inp=inp, suspect_threshold=3, fail_threshold=6)
+
+        self._run_large("spike_test", spike_test)
+
+    def test_rate_of_change_test__large(self):
+        self._run_large("rate_of_change_test", qartod.rate_of_change_test, threshold=2.5)
+
     def test_attenuated_signal_test(self):
         qc = QcConfig(
             {
@@ -256,7 +337,7 @@ class PerformanceTest(unittest.TestCase):
             tinp=self.times,
             zinp=self.zinp,
         )
-        all_tests = [results["qartod"][test_name] for test_name in list(results["qartod"])]
+        all_tests = list(results["qartod"].values())
 
         def run_fn():
             qartod.qartod_compare(all_tests)
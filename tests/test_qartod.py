@@ -1,13 +1,18 @@
 import logging
 import unittest
-import warnings
 
 import numpy as np
 import numpy.testing as npt
-import pandas as pd
 import pytest
+from kernels import python_kernel
 
 from ioos_qc import qartod
+from ioos_qc.utils import to_float_array
+
+try:
+    import dask.array as da
+except ImportError:
+    da = None
 
 L = logging.getLogger("ioos_qc")
 L.setLevel(logging.INFO)
@@ -15,127 +20,103 @@ L.handlers = [logging.StreamHandler()]
 
 
 def dask_arr(vals):
-    """If dask is enabled for this environment, return dask array of values. Otherwise, return values."""
-    try:
-        import dask.array as da
-
-        return da.from_array(vals, chunks=2)
-    except ImportError:
-        return vals
+    """Return a single chunk dask array of values. Callers check that dask is enabled first.
 
+    ``name=False`` gives the array a random name instead of hashing its contents.
+    """
+    return da.from_array(vals, chunks=-1, name=False)
 
-class QartodLocationTest(unittest.TestCase):
-    def test_location(self):
-        """Ensure that longitudes and latitudes are within reasonable bounds."""
-        lon = [80.0, -78.5, 500.500]
-        lat = [np.nan, 50.0, -60.0]
 
-        npt.assert_array_equal(
-            qartod.location_test(lon=lon, lat=lat),
-            np.ma.array([4, 1, 4]),
-        )
+def daily_times(n, start="2019-01-01"):
+    """Return ``n`` datetime64 values one day apart, beginning at ``start``."""
+    return np.datetime64(start) + np.arange(n, dtype="timedelta64[D]")
 
-        lon = np.array(lon)
-        lat = np.array(lat)
-        npt.assert_array_equal(
-            qartod.location_test(lon=lon, lat=lat),
-            np.ma.array([4, 1, 4]),
-        )
 
-        lon = dask_arr(lon)
-        lat = dask_arr(lat)
-        npt.assert_array_equal(
-            qartod.location_test(lon=lon, lat=lat),
-            np.ma.array([4, 1, 4]),
-        )
+def assert_flags_equal(actual, expected):
+    """Assert two flag arrays are equal, comparing small unmasked arrays as plain lists.
 
-    def test_single_location_none(self):
-        # Masked/None/NaN values return "UNKNOWN"
-        lon = [None]
-        lat = [None]
-        npt.assert_array_equal(
-            qartod.location_test(lon=lon, lat=lat),
-            np.ma.array([9]),
-        )
+    ``npt.assert_array_equal`` is only called for large or masked arrays, or to report a mismatch.
+    """
+    if (
+        np.size(expected) <= 16
+        and not np.ma.is_masked(actual)
+        and not np.ma.is_masked(expected)
+        and np.asarray(actual).tolist() == np.asarray(expected).tolist()
+    ):
+        return
+    npt.assert_array_equal(actual, expected)
 
-        lon = np.array(lon)
-        lat = np.array(lat)
-        npt.assert_array_equal(
-            qartod.location_test(lon=lon, lat=lat),
-            np.ma.array([9]),
-        )
 
-        lon = dask_arr(lon)
-        lat = dask_arr(lat)
-        npt.assert_array_equal(
-            qartod.location_test(lon=lon, lat=lat),
-            np.ma.array([9]),
-        )
+def input_variants(vals):
+    """Return list, numpy, masked and (if dask is enabled) dask variants of ``vals``, keyed by backend.
 
-    def test_single_location_nan(self):
-        lon = [np.nan]
-        lat = [np.nan]
-        npt.assert_array_equal(
-            qartod.location_test(lon=lon, lat=lat),
-            np.ma.array([9]),
-        )
+    The masked variant holds zeros under its mask, so it only passes if the mask is honoured.
+    """
+    arr = to_float_array(vals)
+    missing = np.isnan(arr)
+    variants = {
+        "list": vals,
+        "numpy": arr,
+        "masked": np.ma.masked_array(np.where(missing, 0, arr), mask=missing),
+    }
+    if da is not None:
+        variants["dask"] = dask_arr(arr)
+    return variants
 
-        lon = np.array(lon)
-        lat = np.array(lat)
-        npt.assert_array_equal(
-            qartod.location_test(lon=lon, lat=lat),
-            np.ma.array([9]),
-        )
 
-        # Test dask nan input
-        lon = dask_arr(lon)
-        lat = dask_arr(lat)
-        npt.assert_array_equal(
-            qartod.location_test(lon=lon, lat=lat),
-            np.ma.array([9]),
-        )
+# Expected flags are int8 arrays, which hold every QartodFlags value.
+# Flags for four point series that are all flagged the same way
+PASS4 = np.full(4, qartod.QartodFlags.GOOD, dtype=np.int8)
+SUSPECT4 = np.full(4, qartod.QartodFlags.SUSPECT, dtype=np.int8)
+FAIL4 = np.full(4, qartod.QartodFlags.FAIL, dtype=np.int8)
+MISSING4 = np.full(4, qartod.QartodFlags.MISSING, dtype=np.int8)
 
-    def test_location_bad_input(self):
-        match = "could not convert string to float:"
-        # Wrong type lon
-        with pytest.raises(ValueError, match=match):
-            qartod.location_test(lon="hello", lat=70)
 
-        # Wrong type lat
-        with pytest.raises(ValueError, match=match):
-            qartod.location_test(lon=70, lat="foo")
+class QartodLocationTest(unittest.TestCase):
+    def _check_location(self, lon, lat, expected, **kwargs):
+        lons = input_variants(lon)
+        lats = input_variants(lat)
+        expected = np.array(expected, dtype=np.int8)
+        for backend in lons:
+            with self.subTest(backend=backend):
+                assert_flags_equal(
+                    qartod.location_test(lon=lons[backend], lat=lats[backend], **kwargs),
+                    expected,
+                )
 
-        # Wrong type bbox
-        with pytest.raises(TypeError, match="Required: list/tuple, Got:"):
-            qartod.location_test(lon=70, lat=70, bbox="hi")
+    def test_location(self):
+        """Ensure that longitudes and latitudes are within reasonable bounds."""
+        self._check_location([80.0, -78.5, 500.500], [np.nan, 50.0, -60.0], [4, 1, 4])
 
-        # Wrong size bbox
-        with pytest.raises(
-            ValueError,
-            match="Incorrect list/tuple length for",
-        ):
-            qartod.location_test(lon=70, lat=70, bbox=(1, 2))
+    def test_single_location_none(self):
+        # Masked/None/NaN values return "UNKNOWN"
+        self._check_location([None], [None], [9])
 
-    def test_location_bbox(self):
-        lon = [80, -78, -71, -79, 500]
-        lat = [None, 50, 59, 10, -60]
-        npt.assert_array_equal(
-            qartod.location_test(lon=lon, lat=lat, bbox=[-80, 40, -70, 60]),
-            np.ma.array([4, 1, 1, 4, 4]),
-        )
+    def test_single_location_nan(self):
+        self._check_location([np.nan], [np.nan], [9])
 
-        lon = np.asarray([80, -78, -71, -79, 500], dtype=np.float64)
-        lat = np.asarray([None, 50, 59, 10, -60], dtype=np.float64)
-        npt.assert_array_equal(
-            qartod.location_test(lon=lon, lat=lat, bbox=[-80, 40, -70, 60]),
-            np.ma.array([4, 1, 1, 4, 4]),
-        )
+    def test_location_bad_input(self):
+        match = "could not convert string to float:"
+        cases = [
+            # Wrong type lon
+            ({"lon": "hello", "lat": 70}, ValueError, match),
+            # Wrong type lat
+            ({"lon": 70, "lat": "foo"}, ValueError, match),
+            # Wrong type bbox
+            ({"lon": 70, "lat": 70, "bbox": "hi"}, TypeError, "Required: list/tuple, Got:"),
+            # Wrong size bbox
+            ({"lon": 70, "lat": 70, "bbox": (1, 2)}, ValueError, "Incorrect list/tuple length for"),
+        ]
+        for kwargs, exc, exc_match in cases:
+            with self.subTest(**kwargs), pytest.raises(exc, match=exc_match):
+                qartod.location_test(**kwargs)
 
-        lon = dask_arr(np.asarray([80, -78, -71, -79, 500], dtype=np.float64))
-        lat = dask_arr(np.asarray([None, 50, 59, 10, -60], dtype=np.float64))
-        npt.assert_array_equal(
-            qartod.location_test(lon=lon, lat=lat, bbox=[-80, 40, -70, 60]),
-            np.ma.array([4, 1, 1, 4, 4]),
+    def test_location_bbox(self):
+        self._check_location(
+            [80, -78, -71, -79, 500],
+            [None, 50, 59, 10, -60],
+            [4, 1, 1, 4, 4],
+            bbox=[-80, 40, -70, 60],
         )
 
     def test_location_distance_threshold(self):
@@ -143,13 +124,13 @@ class QartodLocationTest(unittest.TestCase):
         lon = np.array([-71.05, -71.06, -80.0])
         lat = np.array([41.0, 41.02, 45.05])
 
-        npt.assert_array_equal(
+        assert_flags_equal(
             qartod.location_test(lon, lat),
-            np.array([1, 1, 1]),
+            np.array([1, 1, 1], dtype=np.int8),
         )
-        npt.assert_array_equal(
+        assert_flags_equal(
             qartod.location_test(lon, lat, range_max=3000.0),
-            np.ma.array([1, 1, 3]),
+            np.array([1, 1, 3], dtype=np.int8),
         )
 
 
@@ -170,7 +151,7 @@ class QartodGrossRangeTest(unittest.TestCase):
             45,  # User range.
             51,  # Sensor range.
         ]
-        result = np.ma.array(
+        result = np.array(
             [
                 4,
                 3,
@@ -183,50 +164,39 @@ class QartodGrossRangeTest(unittest.TestCase):
                 3,
                 4,
             ],
-        )
-
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            inputs = [
-                vals,
-                np.array(vals, dtype=np.integer),
-                np.array(vals, dtype=np.float64),
-                dask_arr(np.array(vals, dtype=np.integer)),
-                dask_arr(np.array(vals, dtype=np.float64)),
-            ]
-
-        for i in inputs:
-            npt.assert_array_equal(
-                qartod.gross_range_test(
-                    inp=i,
-                    fail_span=fail_span,
-                    suspect_span=suspect_span,
-                ),
-                result,
-            )
+            dtype=np.int8,
+        )
+
+        inputs = {
+            "list": vals,
+            "numpy-int": np.array(vals, dtype=np.int64),
+            "numpy-float": np.array(vals, dtype=np.float64),
+        }
+        inputs["masked"] = np.ma.masked_array(inputs["numpy-float"], mask=False)
+        if da is not None:
+            inputs["dask-int"] = dask_arr(inputs["numpy-int"])
+            inputs["dask-float"] = dask_arr(inputs["numpy-float"])
+        for backend, i in inputs.items():
+            with self.subTest(backend=backend):
+                assert_flags_equal(
+                    qartod.gross_range_test(
+                        inp=i,
+                        fail_span=fail_span,
+                        suspect_span=suspect_span,
+                    ),
+                    result,
+                )
 
     def test_gross_range_bad_input(self):
         match = "Required: list/tuple"
-        with pytest.raises(TypeError, match=match):
-            qartod.gross_range_test(
-                inp=np.array([5]),
-                fail_span=10,
-                suspect_span=(1, 1),
-            )
-
-        with pytest.raises(TypeError, match=match):
-            qartod.gross_range_test(
-                inp=np.array([5]),
-                fail_span=(1, 1),
-                suspect_span=10,
-            )
-
-        with pytest.raises(ValueError, match="Suspect Span"):
-            qartod.gross_range_test(
-                inp=np.array([5]),
-                fail_span=(1, 1),
-                suspect_span=(2, 2),
-            )
+        cases = [
+            ({"fail_span": 10, "suspect_span": (1, 1)}, TypeError, match),
+            ({"fail_span": (1, 1), "suspect_span": 10}, TypeError, match),
+            ({"fail_span": (1, 1), "suspect_span": (2, 2)}, ValueError, "Suspect Span"),
+        ]
+        for kwargs, exc, exc_match in cases:
+            with self.subTest(**kwargs), pytest.raises(exc, match=exc_match):
+                qartod.gross_range_test(inp=np.array([5]), **kwargs)
 
     def test_gross_range_check_masked(self):
         """See if user and sensor ranges are picked up."""
@@ -245,7 +215,7 @@ class QartodGrossRangeTest(unittest.TestCase):
             51,  # Sensor range.
             np.ma.masked,  # np.ma.masked
         ]
-        result = np.ma.array(
+        result = np.array(
             [
                 9,
                 3,
@@ -259,28 +229,52 @@ class QartodGrossRangeTest(unittest.TestCase):
                 4,
                 9,
             ],
+            dtype=np.int8,
         )
 
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            inputs = [
-                vals,
-                np.array(vals, dtype=np.float64),
-                dask_arr(np.array(vals, dtype=np.float64)),
-            ]
-
-        for _i in inputs:
-            npt.assert_array_equal(
-                qartod.gross_range_test(
-                    vals,
-                    fail_span,
-                    suspect_span,
-                ),
-                result,
-            )
+        assert_flags_equal(
+            qartod.gross_range_test(vals, fail_span, suspect_span),
+            result,
+        )
+
+        # Flags are element-wise and keep the input shape, so the array variants
+        # can be checked as the rows of a single 2-D call.
+        arr = to_float_array(vals)
+        assert_flags_equal(
+            qartod.gross_range_test(np.stack([arr, arr[::-1]]), fail_span, suspect_span),
+            np.stack([result, result[::-1]]),
+        )
+
+        # The same input as a float masked array, with in range data under the mask
+        masked = np.ma.masked_array(
+            [25, 10, 15, 20, 25, 30, 35, 40, 25, 51, 25],
+            mask=[True, False, False, False, False, False, False, False, True, False, True],
+            dtype=np.float64,
+        )
+        assert_flags_equal(
+            qartod.gross_range_test(masked, fail_span, suspect_span),
+            result,
+        )
 
 
 class QartodClimatologyPeriodTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The same inputs are checked against each kind of period
+        cls.times = np.array(
+            [
+                "2011-02-02",  # in feb, but outside range of valid values
+                "2013-02-03",  # in feb, and within range of valid values
+                "2011-04-01",  # Not run, outside of time range
+                "2011-12-31",  # Not run, outside of time range
+                "2020-02-29",  # leap day, with valid values
+            ],
+            dtype="datetime64[D]",
+        )
+        cls.inputs = input_variants([9, 11, 21, 21, 15])
+        cls.depths = [None, None, None, None, None]
+        cls.expected = np.array([3, 1, 2, 2, 1], dtype=np.int8)
+
     def _run_test(self, tspan, period):
         cc = qartod.ClimatologyConfig()
         cc.add(
@@ -288,56 +282,15 @@ class QartodClimatologyPeriodTest(unittest.TestCase):
             tspan=tspan,  # jan, feb and march
             period=period,
         )
-        test_inputs = [
-            # in feb, but outside range of valid values
-            (
-                np.datetime64("2011-02-02"),
-                9,
-                None,
-            ),
-            # in feb, and within range of valid values
-            (
-                np.datetime64("2013-02-03"),
-                11,
-                None,
-            ),
-            # Not run, outside of time range
-            (
-                np.datetime64("2011-04-01"),
-                21,
-                None,
-            ),
-            # Not run, outside of time range
-            (
-                np.datetime64("2011-12-31"),
-                21,
-                None,
-            ),
-            # leap day, with valid values
-            (
-                np.datetime64("2020-02-29"),
-                15,
-                None,
-            ),
-        ]
-        times, values, depths = zip(*test_inputs)
-        inputs = [
-            values,
-            np.asarray(values, dtype=np.float64),
-            dask_arr(np.asarray(values, dtype=np.float64)),
-        ]
-
-        for i in inputs:
-            results = qartod.climatology_test(
-                config=cc,
-                tinp=times,
-                inp=i,
-                zinp=depths,
-            )
-            npt.assert_array_equal(
-                results,
-                np.ma.array([3, 1, 2, 2, 1]),
-            )
+        for backend, i in self.inputs.items():
+            with self.subTest(backend=backend):
+                results = qartod.climatology_test(
+                    config=cc,
+                    tinp=self.times,
+                    inp=i,
+                    zinp=self.depths,
+                )
+                assert_flags_equal(results, self.expected)
 
     def test_climatology_test_periods_monthly(self):
         self._run_test((0, 3), "month")
@@ -356,12 +309,11 @@ class QartodClimatologyPeriodFullCoverageTest(unittest.TestCase):
     # Test that we can define climatology periods across the whole year,
     # and test data ranges across several years
 
-    def setUp(self):
-        self.tinp = list(
-            pd.date_range(start="2018-01-01", end="2020-12-31", freq="D"),
-        )
-        self.values = np.ones(len(self.tinp))
-        self.zinp = np.zeros(len(self.tinp))
+    @classmethod
+    def setUpClass(cls):
+        cls.tinp = np.arange("2018-01-01", "2021-01-01", dtype="datetime64[D]")
+        cls.values = np.ones(cls.tinp.size)
+        cls.zinp = np.zeros(cls.tinp.size)
 
     def _run_test(self, cc):
         # just run test and make sure we don't get any errors
@@ -466,476 +418,329 @@ class QartodClimatologyPeriodFullCoverageTest(unittest.TestCase):
 class QartodClimatologyInclusiveRangesTest(unittest.TestCase):
     # Test that the various configuration spans (tspan, vspan, fspan, zspan) are
     # inclusive of both endpoints.
-    def setUp(self):
-        self.cc = qartod.ClimatologyConfig()
-        self.cc.add(
+    @classmethod
+    def setUpClass(cls):
+        cls.cc = qartod.ClimatologyConfig()
+        cls.cc.add(
             tspan=(np.datetime64("2019-11-01"), np.datetime64("2020-02-04")),
             fspan=(40, 70),
             vspan=(50, 60),
             zspan=(0, 10),
         )
 
-    def _run_test(self, test_inputs, expected_result):
-        times, values, depths = zip(*test_inputs)
-        inputs = [
-            values,
-            np.asarray(values, dtype=np.float64),
-            dask_arr(np.asarray(values, dtype=np.float64)),
-        ]
-
-        for i in inputs:
-            results = qartod.climatology_test(
-                config=self.cc,
-                tinp=times,
-                inp=i,
-                zinp=depths,
-            )
-            npt.assert_array_equal(
-                results,
-                np.ma.array(expected_result),
-            )
+    def _run_test(self, times, values, depths, expected_result):
+        results = qartod.climatology_test(
+            config=self.cc,
+            tinp=times,
+            inp=to_float_array(values),
+            zinp=depths,
+        )
+        assert_flags_equal(
+            results,
+            np.array(expected_result, dtype=np.int8),
+        )
+
+    def _run_flavors_test(self, times, values, depths, expected_result):
+        # The scenario tests only use float64 arrays; check the other input flavors once
+        expected = np.array(expected_result, dtype=np.int8)
+        for backend, i in input_variants(values).items():
+            with self.subTest(backend=backend):
+                results = qartod.climatology_test(
+                    config=self.cc,
+                    tinp=times,
+                    inp=i,
+                    zinp=depths,
+                )
+                assert_flags_equal(
+                    results,
+                    expected,
+                )
 
-    def test_tspan_out_of_range_low(self):
-        test_inputs = [
-            (
-                np.datetime64("2019-10-31"),
-                55,
-                5,
-            ),
-        ]
-        expected_result = [2]
-        self._run_test(test_inputs, expected_result)
-
-    def test_tspan_minimum(self):
-        test_inputs = [
-            (
-                np.datetime64("2019-11-01"),
-                55,
-                5,
-            ),
-        ]
-        expected_result = [1]
-        self._run_test(test_inputs, expected_result)
-
-    def test_tspan_maximum(self):
-        test_inputs = [
-            (
-                np.datetime64("2020-02-04"),
-                55,
-                5,
-            ),
-        ]
-        expected_result = [1]
-        self._run_test(test_inputs, expected_result)
-
-    def test_tspan_out_of_range_high(self):
-        test_inputs = [
-            (
-                np.datetime64("2020-02-05"),
-                55,
-                5,
-            ),
-        ]
-        expected_result = [2]
-        self._run_test(test_inputs, expected_result)
-
-    def test_vspan_out_of_range_low(self):
-        test_inputs = [
-            (
-                np.datetime64("2020-01-01"),
-                49,
-                5,
-            ),
-        ]
-        expected_result = [3]
-        self._run_test(test_inputs, expected_result)
-
-    def test_vspan_minimum(self):
-        test_inputs = [
-            (
-                np.datetime64("2020-01-01"),
-                50,
-                5,
-            ),
-        ]
-        expected_result = [1]
-        self._run_test(test_inputs, expected_result)
-
-    def test_vspan_maximum(self):
-        test_inputs = [
-            (
-                np.datetime64("2020-01-01"),
-                60,
-                5,
-            ),
-        ]
-        expected_result = [1]
-        self._run_test(test_inputs, expected_result)
-
-    def test_vspan_out_of_range_high(self):
-        test_inputs = [
-            (
-                np.datetime64("2020-01-01"),
-                61,
-                5,
-            ),
-        ]
-        expected_result = [3]
-        self._run_test(test_inputs, expected_result)
-
-    def test_fspan_out_of_range_low(self):
-        test_inputs = [
-            (
-                np.datetime64("2020-01-01"),
-                30,
-                5,
-            ),
-        ]
-        expected_result = [4]
-        self._run_test(test_inputs, expected_result)
-
-    def test_fspan_minimum(self):
-        test_inputs = [
-            (
-                np.datetime64("2020-01-01"),
-                40,
-                5,
-            ),
-        ]
-        expected_result = [3]
-        self._run_test(test_inputs, expected_result)
-
-    def test_fspan_maximum(self):
-        test_inputs = [
-            (
-                np.datetime64("2020-01-01"),
-                70,
-                5,
-            ),
-        ]
-        expected_result = [3]
-        self._run_test(test_inputs, expected_result)
-
-    def test_fspan_out_of_range_high(self):
-        test_inputs = [
-            (
-                np.datetime64("2020-01-01"),
-                71,
-                5,
-            ),
-        ]
-        expected_result = [4]
-        self._run_test(test_inputs, expected_result)
-
-    def test_zspan_out_of_range_low(self):
-        test_inputs = [
-            (
-                np.datetime64("2020-01-01"),
-                55,
-                -1,
-            ),
-        ]
-        expected_result = [2]
-        self._run_test(test_inputs, expected_result)
-
-    def test_zspan_minimum(self):
-        test_inputs = [
-            (
-                np.datetime64("2020-01-01"),
-                55,
-                0,
-            ),
-        ]
-        expected_result = [1]
-        self._run_test(test_inputs, expected_result)
-
-    def test_zspan_maximum(self):
-        test_inputs = [
-            (
-                np.datetime64("2020-01-01"),
-                55,
-                10,
-            ),
-        ]
-        expected_result = [1]
-        self._run_test(test_inputs, expected_result)
-
-    def test_zspan_out_of_range_high(self):
-        test_inputs = [
-            (
-                np.datetime64("2020-01-01"),
-                55,
-                11,
-            ),
+    def test_input_flavors(self):
+        times = np.full(6, np.datetime64("2020-01-01"))
+        values = [49, 50, 60, 61, 30, 71]
+        depths = [5, 5, 5, 5, 5, 5]
+        self._run_flavors_test(times, values, depths, [3, 1, 1, 3, 4, 4])
+
+    def test_inclusive_ranges(self):
+        cases = [
+            # (name, time, value, depth, expected flag)
+            ("tspan_out_of_range_low", "2019-10-31", 55, 5, 2),
+            ("tspan_minimum", "2019-11-01", 55, 5, 1),
+            ("tspan_maximum", "2020-02-04", 55, 5, 1),
+            ("tspan_out_of_range_high", "2020-02-05", 55, 5, 2),
+            ("vspan_out_of_range_low", "2020-01-01", 49, 5, 3),
+            ("vspan_minimum", "2020-01-01", 50, 5, 1),
+            ("vspan_maximum", "2020-01-01", 60, 5, 1),
+            ("vspan_out_of_range_high", "2020-01-01", 61, 5, 3),
+            ("fspan_out_of_range_low", "2020-01-01", 30, 5, 4),
+            ("fspan_minimum", "2020-01-01", 40, 5, 3),
+            ("fspan_maximum", "2020-01-01", 70, 5, 3),
+            ("fspan_out_of_range_high", "2020-01-01", 71, 5, 4),
+            ("zspan_out_of_range_low", "2020-01-01", 55, -1, 2),
+            ("zspan_minimum", "2020-01-01", 55, 0, 1),
+            ("zspan_maximum", "2020-01-01", 55, 10, 1),
+            ("zspan_out_of_range_high", "2020-01-01", 55, 11, 2),
         ]
-        expected_result = [2]
-        self._run_test(test_inputs, expected_result)
+        for name, time, value, depth, expected in cases:
+            with self.subTest(name):
+                times = np.array([time], dtype="datetime64[D]")
+                self._run_test(times, [value], [depth], [expected])
 
 
 class QartodClimatologyDepthTest(unittest.TestCase):
-    def setUp(self):
-        self.cc = qartod.ClimatologyConfig()
+    @classmethod
+    def setUpClass(cls):
+        cls.cc = qartod.ClimatologyConfig()
         # with depths
-        self.cc.add(
+        cls.cc.add(
             tspan=(np.datetime64("2012-01"), np.datetime64("2013-01")),
             vspan=(50, 60),
             zspan=(0, 10),
         )
         # same as above, but different depths
-        self.cc.add(
+        cls.cc.add(
             tspan=(np.datetime64("2012-01"), np.datetime64("2013-01")),
             vspan=(70, 80),
             zspan=(10, 100),
         )
 
-    def _run_test(self, test_inputs, expected_result):
-        times, values, depths = zip(*test_inputs)
-        inputs = [
-            values,
-            np.asarray(values, dtype=np.float64),
-            dask_arr(np.asarray(values, dtype=np.float64)),
-        ]
-
-        for i in inputs:
-            results = qartod.climatology_test(
-                config=self.cc,
-                tinp=times,
-                inp=i,
-                zinp=depths,
-            )
-            npt.assert_array_equal(
-                results,
-                np.ma.array(expected_result),
-            )
+    def _run_test(self, times, values, depths, expected_result):
+        expected = np.array(expected_result, dtype=np.int8)
+        for backend, i in input_variants(values).items():
+            with self.subTest(backend=backend):
+                results = qartod.climatology_test(
+                    config=self.cc,
+                    tinp=times,
+                    inp=i,
+                    zinp=depths,
+                )
+                assert_flags_equal(
+                    results,
+                    expected,
+                )
 
     def test_climatology_test_all_unknown(self):
         # Our configs only define depths, so this is never run if no
         # depths are passed in for any of the values
-        test_inputs = [
-            (
-                np.datetime64("2011-01-02"),
-                9,
-                None,
-            ),
-            (
-                np.datetime64("2011-01-02"),
-                11,
-                None,
-            ),
-            (
-                np.datetime64("2011-01-02"),
-                21,
-                None,
-            ),
-            # not run, outside given time ranges
-            (
-                np.datetime64("2015-01-02"),
-                21,
-                None,
-            ),
-        ]
-        expected_result = [2, 2, 2, 2]
-        self._run_test(test_inputs, expected_result)
+        times = np.array(
+            [
+                "2011-01-02",
+                "2011-01-02",
+                "2011-01-02",
+                "2015-01-02",  # not run, outside given time ranges
+            ],
+            dtype="datetime64[D]",
+        )
+        values = [9, 11, 21, 21]
+        depths = [None, None, None, None]
+        expected_result = np.array([2, 2, 2, 2], dtype=np.int8)
+        self._run_test(times, values, depths, expected_result)
 
 
 class QartodClimatologyMissingTest(unittest.TestCase):
-    def setUp(self):
-        self.cc = qartod.ClimatologyConfig()
+    @classmethod
+    def setUpClass(cls):
+        cls.cc = qartod.ClimatologyConfig()
         # different time range, no depth
-        self.cc.add(
+        cls.cc.add(
             tspan=(np.datetime64("2021-07"), np.datetime64("2021-09")),
             vspan=(3.4, 5),
         )
 
-    def _run_test(self, test_inputs, expected_result):
-        times, values, depths = zip(*test_inputs)
-        inputs = [
-            values,
-            np.asarray(values, dtype=np.float64),
-            dask_arr(np.asarray(values, dtype=np.float64)),
-        ]
-
-        for i in inputs:
-            results = qartod.climatology_test(
-                config=self.cc,
-                tinp=times,
-                inp=i,
-                zinp=depths,
-            )
-            npt.assert_array_equal(
-                results,
-                np.ma.array(expected_result),
-            )
+    def _run_test(self, times, values, depths, expected_result):
+        expected = np.array(expected_result, dtype=np.int8)
+        for backend, i in input_variants(values).items():
+            with self.subTest(backend=backend):
+                results = qartod.climatology_test(
+                    config=self.cc,
+                    tinp=times,
+                    inp=i,
+                    zinp=depths,
+                )
+                assert_flags_equal(
+                    results,
+                    expected,
+                )
 
     def test_climatology_missing_values(self):
-        test_inputs = [
-            # Not missing value or depth, value out of bounds
-            (
-                np.datetime64("2021-07-16"),
-                0,
-                0,
-            ),
-            # Missing value and depth
-            (
-                np.datetime64("2021-07-16"),
-                np.nan,
-                np.nan,
-            ),
-            # Not missing value and depth, value within bounds
-            (
-                np.datetime64("2021-07-16"),
-                4.16743,
-                0.08931513,
-            ),
-        ]
-        expected_result = [3, 9, 1]
-        self._run_test(test_inputs, expected_result)
+        times = np.array(
+            ["2021-07-16", "2021-07-16", "2021-07-16"],
+            dtype="datetime64[D]",
+        )
+        # Not missing value or depth, value out of bounds
+        # Missing value and depth
+        # Not missing value and depth, value within bounds
+        values = [0, np.nan, 4.16743]
+        depths = [0, np.nan, 0.08931513]
+        expected_result = np.array([3, 9, 1], dtype=np.int8)
+        self._run_test(times, values, depths, expected_result)
 
 
 class QartodClimatologyTest(unittest.TestCase):
-    def setUp(self):
-        self.cc = qartod.ClimatologyConfig()
-        self.cc.add(
+    @classmethod
+    def setUpClass(cls):
+        cls.cc = qartod.ClimatologyConfig()
+        cls.cc.add(
             tspan=(np.datetime64("2011-01"), np.datetime64("2011-07")),
             vspan=(10, 20),
         )
-        self.cc.add(
+        cls.cc.add(
             tspan=(np.datetime64("2011-07"), np.datetime64("2012-01")),
             vspan=(30, 40),
         )
-        self.cc.add(
+        cls.cc.add(
             tspan=(np.datetime64("2012-01"), np.datetime64("2013-01")),
             vspan=(40, 50),
         )
         # same time range as above, but with depths
-        self.cc.add(
+        cls.cc.add(
             tspan=(np.datetime64("2012-01"), np.datetime64("2013-01")),
             vspan=(50, 60),
             zspan=(0, 10),
         )
         # same as above, but different depths
-        self.cc.add(
+        cls.cc.add(
             tspan=(np.datetime64("2012-01"), np.datetime64("2013-01")),
             vspan=(70, 80),
             zspan=(10, 100),
         )
 
-    def _run_test(self, test_inputs, expected_result):
-        times, values, depths = zip(*test_inputs)
-        inputs = [
-            values,
-            np.asarray(values, dtype=np.float64),
-            dask_arr(np.asarray(values, dtype=np.float64)),
-        ]
+    def _run_test(self, times, values, depths, expected_result):
+        results = qartod.climatology_test(
+            config=self.cc,
+            tinp=times,
+            inp=to_float_array(values),
+            zinp=depths,
+        )
+        assert_flags_equal(
+            results,
+            np.array(expected_result, dtype=np.int8),
+        )
+
+    def _run_flavors_test(self, times, values, depths, expected_result):
+        # The scenario tests only use float64 arrays; check the other input flavors once
+        expected = np.array(expected_result, dtype=np.int8)
+        for backend, i in input_variants(values).items():
+            with self.subTest(backend=backend):
+                results = qartod.climatology_test(
+                    config=self.cc,
+                    tinp=times,
+                    inp=i,
+                    zinp=depths,
+                )
+                assert_flags_equal(
+                    results,
+                    expected,
+                )
 
-        for i in inputs:
-            results = qartod.climatology_test(
-                config=self.cc,
-                tinp=times,
-                inp=i,
-                zinp=depths,
-            )
-            npt.assert_array_equal(
-                results,
-                np.ma.array(expected_result),
-            )
+    def test_input_flavors(self):
+        times = np.array(
+            ["2011-01-02", "2011-01-02", "2012-01-02", "2012-01-02", "2015-01-02"],
+            dtype="datetime64[D]",
+        )
+        values = [9, 11, 51, 59, 21]
+        depths = [None, None, 2, 11, None]
+        self._run_flavors_test(times, values, depths, [3, 1, 1, 3, 2])
 
     def test_climatology_test(self):
-        test_inputs = [
-            (
-                np.datetime64("2011-01-02"),
-                11,
-                None,
-            ),
-        ]
-        expected_result = [1]
-        self._run_test(test_inputs, expected_result)
+        times = np.array(["2011-01-02"], dtype="datetime64[D]")
+        self._run_test(times, [11], [None], [1])
 
     def test_climatology_test_seconds_since_epoch(self):
-        test_inputs = [
-            (
-                1293926400,  # Sunday, January 2, 2011 12:00:00 AM UTC
-                11,
-                None,
-            ),
-        ]
-        expected_result = [1]
-        self._run_test(test_inputs, expected_result)
+        times = [1293926400]  # Sunday, January 2, 2011 12:00:00 AM UTC
+        self._run_test(times, [11], [None], [1])
 
     def test_climatology_test_fail(self):
-        test_inputs = [
-            (
-                np.datetime64("2011-01-02"),
-                9,
-                None,
-            ),
-            (
-                np.datetime64("2011-01-02"),
-                11,
-                None,
-            ),
-            (
-                np.datetime64("2011-01-02"),
-                21,
-                None,
-            ),
-            # not run, outside given time ranges
-            (
-                np.datetime64("2015-01-02"),
-                21,
-                None,
-            ),
-        ]
-        expected_result = [3, 1, 3, 2]
-        self._run_test(test_inputs, expected_result)
+        times = np.array(
+            [
+                "2011-01-02",
+                "2011-01-02",
+                "2011-01-02",
+                "2015-01-02",  # not run, outside given time ranges
+            ],
+            dtype="datetime64[D]",
+        )
+        values = [9, 11, 21, 21]
+        depths = [None, None, None, None]
+        expected_result = np.array([3, 1, 3, 2], dtype=np.int8)
+        self._run_test(times, values, depths, expected_result)
 
     def test_climatology_test_depths(self):
-        test_inputs = [
-            # (0, 10) depth range, valid value
-            (
-                np.datetime64("2012-01-02"),
-                51,
-                2,
-            ),
-            # (10, 100) depth range, valid value
-            (
-                np.datetime64("2012-01-02"),
-                71,
-                90,
-            ),
-            # no depth range, valid value
-            (
-                np.datetime64("2012-01-02"),
-                42,
-                None,
-            ),
-            # no depth range, invalid value
-            (
-                np.datetime64("2012-01-02"),
-                39,
-                None,
-            ),
-            # (10, 100) depth range, invalid value
-            (
-                np.datetime64("2012-01-02"),
-                59,
-                11,
-            ),
-            # Not run, has depth that's outside of given depth ranges
-            (
-                np.datetime64("2012-01-02"),
-                79,
-                101,
-            ),
-        ]
-        expected_result = [1, 1, 1, 3, 3, 3]
-        self._run_test(test_inputs, expected_result)
+        times = np.array(
+            [
+                "2012-01-02",  # (0, 10) depth range, valid value
+                "2012-01-02",  # (10, 100) depth range, valid value
+                "2012-01-02",  # no depth range, valid value
+                "2012-01-02",  # no depth range, invalid value
+                "2012-01-02",  # (10, 100) depth range, invalid value
+                "2012-01-02",  # Not run, has depth that's outside of given depth ranges
+            ],
+            dtype="datetime64[D]",
+        )
+        values = [51, 71, 42, 39, 59, 79]
+        depths = [2, 90, None, None, 11, 101]
+        expected_result = np.array([1, 1, 1, 3, 3, 3], dtype=np.int8)
+        self._run_test(times, values, depths, expected_result)
+
+    def test_climatology_test_many_windows(self):
+        # 1000 two day windows with a one day gap between each, added out of order
+        # so they are looked up as one sorted run rather than member by member
+        start = np.datetime64("2000-01-01")
+        cc = qartod.ClimatologyConfig()
+        for k in np.random.default_rng(42).permutation(1000):
+            cc.add(
+                tspan=(start + 3 * k, start + 3 * k + 1),
+                vspan=(k, k + 10),
+                fspan=(k - 10, k + 20) if k % 2 else None,
+            )
+
+        days = np.arange(10_000) % 3000
+        window = days // 3
+        values = window + 5.0
+        values[::7] = window[::7] - 1  # below vspan
+        values[::11] = window[::11] - 11  # below fspan, when there is one
+        values[::13] = np.nan
+
+        expected = np.full(days.size, qartod.QartodFlags.GOOD, dtype=np.int8)
+        expected[::7] = qartod.QartodFlags.SUSPECT
+        expected[::11] = np.where(
+            window[::11] % 2,
+            qartod.QartodFlags.FAIL,
+            qartod.QartodFlags.SUSPECT,
+        )
+        expected[days % 3 == 2] = qartod.QartodFlags.UNKNOWN
+        expected[::13] = qartod.QartodFlags.MISSING
+
+        results = qartod.climatology_test(
+            config=cc,
+            tinp=start + days.astype("timedelta64[D]"),
+            inp=values,
+            zinp=np.full(days.size, np.nan),
+        )
+        assert_flags_equal(results, expected)
+
+
+# Shared by the spike method, bad method and threshold input tests
+SPIKE_METHODS_INP = to_float_array(
+    [3, 4.99, 5, 6, 8, 6, 6, 6.75, 6, 6, 5.3, 6, 6, 9, 5, None, 4, 4],
+)
+SPIKE_METHODS_INP.setflags(write=False)
 
 
 class QartodSpikeTest(unittest.TestCase):
-    def setUp(self):
-        self.suspect_threshold = 25
-        self.fail_threshold = 50
+    @classmethod
+    def setUpClass(cls):
+        cls.suspect_threshold = 25
+        cls.fail_threshold = 50
+
+    def _check_spike(self, arr, expected, **kwargs):
+        """Check ``arr`` in every input format against ``expected``."""
+        kwargs.setdefault("suspect_threshold", self.suspect_threshold)
+        kwargs.setdefault("fail_threshold", self.fail_threshold)
+        for backend, values in input_variants(arr).items():
+            with self.subTest(backend=backend):
+                assert_flags_equal(qartod.spike_test(inp=values, **kwargs), expected)
 
     def test_spike(self):
         """Test to make ensure single value spike detection works properly."""
@@ -943,22 +748,9 @@ class QartodSpikeTest(unittest.TestCase):
 
         # First and last elements should always be good data, unless someone
         # has set a threshold to zero.
-        expected = [2, 4, 4, 4, 1, 3, 1, 2]
+        expected = np.array([2, 4, 4, 4, 1, 3, 1, 2], dtype=np.int8)
 
-        inputs = [
-            arr,
-            np.asarray(arr, dtype=np.float64),
-            dask_arr(np.asarray(arr, dtype=np.float64)),
-        ]
-        for i in inputs:
-            npt.assert_array_equal(
-                qartod.spike_test(
-                    inp=i,
-                    suspect_threshold=self.suspect_threshold,
-                    fail_threshold=self.fail_threshold,
-                ),
-                expected,
-            )
+        self._check_spike(arr, expected)
 
     def test_spike_negative_vals(self):
         """Test to make spike detection works properly for negative values."""
@@ -966,36 +758,15 @@ class QartodSpikeTest(unittest.TestCase):
 
         # First and last elements should always be good data, unless someone
         # has set a threshold to zero.
-        expected = [2, 4, 4, 4, 1, 3, 1, 2]
+        expected = np.array([2, 4, 4, 4, 1, 3, 1, 2], dtype=np.int8)
 
-        inputs = [
-            arr,
-            np.asarray(arr, dtype=np.float64),
-            dask_arr(np.asarray(arr, dtype=np.float64)),
-        ]
-        for i in inputs:
-            npt.assert_array_equal(
-                qartod.spike_test(
-                    inp=i,
-                    suspect_threshold=self.suspect_threshold,
-                    fail_threshold=self.fail_threshold,
-                ),
-                expected,
-            )
+        self._check_spike(arr, expected)
 
     def test_spike_initial_final_values(self):
         """The test is not defined for the initial and final values in the array."""
         arr = [-100, -99, -99, -98]
-        expected = [2, 1, 1, 2]
-
-        npt.assert_array_equal(
-            qartod.spike_test(
-                inp=arr,
-                suspect_threshold=self.suspect_threshold,
-                fail_threshold=self.fail_threshold,
-            ),
-            expected,
-        )
+        expected = np.array([2, 1, 1, 2], dtype=np.int8)
+        self._check_spike(arr, expected)
 
     def test_spike_masked(self):
         """Test with missing data."""
@@ -1018,22 +789,9 @@ class QartodSpikeTest(unittest.TestCase):
 
         # First and last elements should always be good data, unless someone
         # has set a threshold to zero.
-        expected = [2, 4, 4, 4, 1, 3, 1, 9, 9, 9, 4, 4, 9, 9]
+        expected = np.array([2, 4, 4, 4, 1, 3, 1, 9, 9, 9, 4, 4, 9, 9], dtype=np.int8)
 
-        inputs = [
-            arr,
-            np.asarray(arr, dtype=np.float64),
-            dask_arr(np.asarray(arr, dtype=np.float64)),
-        ]
-        for i in inputs:
-            npt.assert_array_equal(
-                qartod.spike_test(
-                    inp=i,
-                    suspect_threshold=self.suspect_threshold,
-                    fail_threshold=self.fail_threshold,
-                ),
-                expected,
-            )
+        self._check_spike(arr, expected)
 
     def test_spike_realdata(self):
         """Test with real-world data."""
@@ -1073,224 +831,127 @@ class QartodSpikeTest(unittest.TestCase):
             -0.0762,
         ]
 
-        expected = [
-            2,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            3,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            2,
-        ]
+        expected = np.array(
+            [
+                2,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                3,
+                1,
+                1,
+                1,
+                1,
+                1,
+                1,
+                2,
+            ],
+            dtype=np.int8,
+        )
 
-        inputs = [
+        self._check_spike(
             arr,
-            np.asarray(arr, dtype=np.float64),
-            dask_arr(np.asarray(arr, dtype=np.float64)),
-        ]
-        for i in inputs:
-            npt.assert_array_equal(
-                qartod.spike_test(
-                    inp=i,
-                    suspect_threshold=suspect_threshold,
-                    fail_threshold=fail_threshold,
-                ),
-                expected,
-            )
+            expected,
+            suspect_threshold=suspect_threshold,
+            fail_threshold=fail_threshold,
+        )
 
     def test_spike_methods(self):
         """Test the different input methods and review the different flags expected."""
-        inp = [3, 4.99, 5, 6, 8, 6, 6, 6.75, 6, 6, 5.3, 6, 6, 9, 5, None, 4, 4]
+        inp = SPIKE_METHODS_INP
         suspect_threshold = 0.5
         fail_threshold = 1
-        average_method_expected = [
-            2,
-            3,
-            1,
-            1,
-            4,
-            3,
-            1,
-            3,
-            1,
-            1,
-            3,
-            1,
-            4,
-            4,
-            9,
-            9,
-            9,
-            2,
-        ]
-        diff_method_expected = [
-            2,
-            1,
-            1,
-            1,
-            4,
-            1,
-            1,
-            3,
-            1,
-            1,
-            3,
-            1,
-            1,
-            4,
-            9,
-            9,
-            9,
-            2,
-        ]
-
-        # Test average method
-        npt.assert_array_equal(
-            qartod.spike_test(
-                inp=inp,
-                suspect_threshold=suspect_threshold,
-                fail_threshold=fail_threshold,
-                method="average",
-            ),
-            average_method_expected,
+        average_method_expected = np.array(
+            [2, 3, 1, 1, 4, 3, 1, 3, 1, 1, 3, 1, 4, 4, 9, 9, 9, 2],
+            dtype=np.int8,
         )
-
-        # Test diff method
-        npt.assert_array_equal(
-            qartod.spike_test(
-                inp=inp,
-                suspect_threshold=suspect_threshold,
-                fail_threshold=fail_threshold,
-                method="differential",
-            ),
-            diff_method_expected,
+        diff_method_expected = np.array(
+            [2, 1, 1, 1, 4, 1, 1, 3, 1, 1, 3, 1, 1, 4, 9, 9, 9, 2],
+            dtype=np.int8,
         )
 
-        # Test default method (average)
-        npt.assert_array_equal(
-            qartod.spike_test(
-                inp=inp,
-                suspect_threshold=suspect_threshold,
-                fail_threshold=fail_threshold,
-            ),
-            average_method_expected,
-        )
+        # The default method is average
+        cases = [
+            ({"method": "average"}, average_method_expected),
+            ({"method": "differential"}, diff_method_expected),
+            ({}, average_method_expected),
+        ]
+        for method, expected in cases:
+            with self.subTest(**method):
+                assert_flags_equal(
+                    qartod.spike_test(
+                        inp=inp,
+                        suspect_threshold=suspect_threshold,
+                        fail_threshold=fail_threshold,
+                        **method,
+                    ),
+                    expected,
+                )
 
     def test_spike_test_bad_method(self):
-        inp = [3, 4.99, 5, 6, 8, 6, 6, 6.75, 6, 6, 5.3, 6, 6, 9, 5, None, 4, 4]
+        inp = SPIKE_METHODS_INP
         suspect_threshold = 0.5
         fail_threshold = 1
 
-        match = "Unknown method:"
-        with pytest.raises(ValueError, match=match):
-            qartod.spike_test(
-                inp=inp,
-                suspect_threshold=suspect_threshold,
-                fail_threshold=fail_threshold,
-                method="bad",
-            )
-        with pytest.raises(ValueError, match=match):
-            qartod.spike_test(
-                inp=inp,
-                suspect_threshold=suspect_threshold,
-                fail_threshold=fail_threshold,
-                method=123,
-            )
+        for method in ("bad", 123):
+            with self.subTest(method=method), pytest.raises(ValueError, match="Unknown method:"):
+                qartod.spike_test(
+                    inp=inp,
+                    suspect_threshold=suspect_threshold,
+                    fail_threshold=fail_threshold,
+                    method=method,
+                )
 
     def test_spike_test_inputs(self):
-        inp = [3, 4.99, 5, 6, 8, 6, 6, 6.75, 6, 6, 5.3, 6, 6, 9, 5, None, 4, 4]
-        expected_suspect_only = [
-            2,
-            3,
-            1,
-            1,
-            3,
-            3,
-            1,
-            3,
-            1,
-            1,
-            3,
-            1,
-            3,
-            3,
-            9,
-            9,
-            9,
-            2,
-        ]
-        expected_fail_only = [
-            2,
-            1,
-            1,
-            1,
-            4,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            4,
-            4,
-            9,
-            9,
-            9,
-            2,
+        inp = SPIKE_METHODS_INP
+        expected_suspect_only = np.array(
+            [2, 3, 1, 1, 3, 3, 1, 3, 1, 1, 3, 1, 3, 3, 9, 9, 9, 2],
+            dtype=np.int8,
+        )
+        expected_fail_only = np.array(
+            [2, 1, 1, 1, 4, 1, 1, 1, 1, 1, 1, 1, 4, 4, 9, 9, 9, 2],
+            dtype=np.int8,
+        )
+        cases = [
+            ({"suspect_threshold": 0.5}, expected_suspect_only),
+            ({"fail_threshold": 1}, expected_fail_only),
         ]
-        suspect_threshold = 0.5
-        fail_threshold = 1
-
-        npt.assert_array_equal(
-            qartod.spike_test(
-                inp=inp,
-                suspect_threshold=suspect_threshold,
-            ),
-            expected_suspect_only,
-        )
-        npt.assert_array_equal(
-            qartod.spike_test(
-                inp=inp,
-                fail_threshold=fail_threshold,
-            ),
-            expected_fail_only,
-        )
+        for thresholds, expected in cases:
+            with self.subTest(**thresholds):
+                assert_flags_equal(qartod.spike_test(inp=inp, **thresholds), expected)
 
 
 class QartodRateOfChangeTest(unittest.TestCase):
-    def setUp(self):
-        self.times = np.arange(
+    @classmethod
+    def setUpClass(cls):
+        cls.times = np.arange(
             "2015-01-01 00:00:00",
             "2015-01-01 06:00:00",
             step=np.timedelta64(15, "m"),
             dtype=np.datetime64,
         )
-        self.times_epoch_secs = [t.astype(int) for t in self.times]
-        self.threshold = 5 / 15 / 60  # 5 units per 15 minutes --> 5/15/60 units per second
+        cls.times_epoch_secs = cls.times.astype("datetime64[s]").astype(np.int64)
+        cls.times.setflags(write=False)
+        cls.times_epoch_secs.setflags(write=False)
+        cls.threshold = 5 / 15 / 60  # 5 units per 15 minutes --> 5/15/60 units per second
 
     def test_rate_of_change(self):
         times = self.times
@@ -1320,49 +981,23 @@ class QartodRateOfChangeTest(unittest.TestCase):
             4,
             5,
         ]
-        expected = [
-            1,
-            3,
-            3,
-            1,
-            1,
-            1,
-            1,
-            1,
-            3,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            3,
-            1,
-            1,
-            1,
-            3,
-            1,
-            1,
-            1,
-            1,
-        ]
-        inputs = [
-            arr,
-            np.asarray(arr, dtype=np.float64),
-            dask_arr(np.asarray(arr, dtype=np.float64)),
-        ]
-        for i in inputs:
-            result = qartod.rate_of_change_test(
-                inp=i,
-                tinp=times,
-                threshold=self.threshold,
-            )
-            npt.assert_array_equal(expected, result)
+        expected = np.array(
+            [1, 3, 3, 1, 1, 1, 1, 1, 3, 1, 1, 1, 1, 1, 1, 3, 1, 1, 1, 3, 1, 1, 1, 1],
+            dtype=np.int8,
+        )
+        for backend, values in input_variants(arr).items():
+            with self.subTest(backend=backend):
+                result = qartod.rate_of_change_test(
+                    inp=values,
+                    tinp=times,
+                    threshold=self.threshold,
+                )
+                assert_flags_equal(expected, result)
 
         # test epoch secs - should return same result
-        npt.assert_array_equal(
+        assert_flags_equal(
             qartod.rate_of_change_test(
-                inp=i,
+                inp=arr,
                 tinp=self.times_epoch_secs,
                 threshold=self.threshold,
             ),
@@ -1372,38 +1007,89 @@ class QartodRateOfChangeTest(unittest.TestCase):
     def test_rate_of_change_missing_values(self):
         times = self.times[0:8]
         arr = [2, 10, 2, 3, None, None, 7, 10]
-        expected = [1, 3, 3, 1, 9, 9, 1, 1]
+        expected = np.array([1, 3, 3, 1, 9, 9, 1, 1], dtype=np.int8)
         result = qartod.rate_of_change_test(
             inp=arr,
             tinp=times,
             threshold=self.threshold,
         )
-        npt.assert_array_equal(expected, result)
+        assert_flags_equal(expected, result)
 
     def test_rate_of_change_negative_values(self):
         times = self.times[0:4]
         arr = [-2, -10, -2, -3]
-        expected = [1, 3, 3, 1]
+        expected = np.array([1, 3, 3, 1], dtype=np.int8)
         result = qartod.rate_of_change_test(
             inp=arr,
             tinp=times,
             threshold=self.threshold,
         )
-        npt.assert_array_equal(expected, result)
+        assert_flags_equal(expected, result)
 
 
 class QartodFlatLineTest(unittest.TestCase):
-    def setUp(self):
-        self.times = np.arange(
+    @classmethod
+    def setUpClass(cls):
+        cls.times = np.arange(
             "2015-01-01 00:00:00",
             "2015-01-01 03:30:00",
             step=np.timedelta64(15, "m"),
             dtype=np.datetime64,
         )
-        self.times_epoch_secs = [t.astype(int) for t in self.times]
-        self.suspect_threshold = 3000  # 50 mins, or count of 3
-        self.fail_threshold = 4800  # 80 mins, or count of 5
-        self.tolerance = 0.01
+        cls.times_epoch_secs = cls.times.astype("datetime64[s]").astype(np.int64)
+        cls.times.setflags(write=False)
+        cls.times_epoch_secs.setflags(write=False)
+        cls.suspect_threshold = 3000  # 50 mins, or count of 3
+        cls.fail_threshold = 4800  # 80 mins, or count of 5
+        cls.tolerance = 0.01
+        # Random fixtures are drawn once from a fixed seed, so each test sees the
+        # same data no matter which tests run or in what order
+        rng = np.random.default_rng(0)
+        cls.noise = rng.normal(size=len(cls.times))
+        cls.kernel_values = rng.choice([1.0, 1.001, 2.0, np.nan], size=(20, len(cls.times)))
+        cls.noise.setflags(write=False)
+        cls.kernel_values.setflags(write=False)
+
+    def _flat_line_oracle(self, stacked, tolerance):
+        """Compute reference flags for each row of ``stacked`` with sliding windows."""
+        interval = np.median(np.diff(self.times)).astype("timedelta64[s]").astype(float)
+        flags = np.full(stacked.shape, qartod.QartodFlags.GOOD, dtype=np.uint8)
+        for threshold, flag in (
+            (self.suspect_threshold, qartod.QartodFlags.SUSPECT),
+            (self.fail_threshold, qartod.QartodFlags.FAIL),
+        ):
+            count = int(threshold / interval)
+            if stacked.shape[1] <= count:
+                continue
+            windows = np.lib.stride_tricks.sliding_window_view(stacked, count + 1, axis=1)
+            # fmax/fmin skip NaNs and quietly give NaN for all-missing windows
+            data_range = np.fmax.reduce(windows, axis=-1) - np.fmin.reduce(windows, axis=-1)
+            flat = np.zeros(stacked.shape, dtype=bool)
+            flat[:, count:] = data_range < tolerance
+            flags[flat] = flag
+        flags[np.isnan(stacked)] = qartod.QartodFlags.MISSING
+        return flags
+
+    def _run_flat_line_variants(self, arr, expected):
+        values = to_float_array(arr)
+        kwargs = {
+            "tinp": self.times,
+            "suspect_threshold": self.suspect_threshold,
+            "fail_threshold": self.fail_threshold,
+            "tolerance": self.tolerance,
+        }
+        results = np.stack(
+            [qartod.flat_line_test(inp=i, **kwargs) for i in (arr, values)],
+        )
+        stacked = np.vstack([values, values])
+        assert_flags_equal(results, np.broadcast_to(expected, stacked.shape))
+        assert_flags_equal(self._flat_line_oracle(stacked, self.tolerance), results)
+
+        if da is not None:
+            assert_flags_equal(
+                qartod.flat_line_test(inp=dask_arr(values), **kwargs),
+                expected,
+            )
 
     def test_flat_line(self):
         arr = [
@@ -1422,24 +1108,11 @@ class QartodFlatLineTest(unittest.TestCase):
             3.0005,
             3.00001,
         ]
-        expected = [1, 1, 1, 1, 3, 3, 4, 4, 1, 1, 1, 1, 1, 3]
-        inputs = [
-            arr,
-            np.asarray(arr, dtype=np.float64),
-            dask_arr(np.asarray(arr, dtype=np.float64)),
-        ]
-        for i in inputs:
-            result = qartod.flat_line_test(
-                inp=i,
-                tinp=self.times,
-                suspect_threshold=self.suspect_threshold,
-                fail_threshold=self.fail_threshold,
-                tolerance=self.tolerance,
-            )
-            npt.assert_array_equal(result, expected)
+        expected = np.array([1, 1, 1, 1, 3, 3, 4, 4, 1, 1, 1, 1, 1, 3], dtype=np.int8)
+        self._run_flat_line_variants(arr, expected)
 
         # test epoch secs - should return same result
-        npt.assert_array_equal(
+        assert_flags_equal(
             qartod.flat_line_test(
                 inp=arr,
                 tinp=self.times_epoch_secs,
@@ -1451,46 +1124,57 @@ class QartodFlatLineTest(unittest.TestCase):
         )
 
         # test negative array - should return same result
-        arr = [-1 * x for x in arr]
-        npt.assert_array_equal(
-            qartod.flat_line_test(
-                inp=arr,
-                tinp=self.times,
-                suspect_threshold=self.suspect_threshold,
-                fail_threshold=self.fail_threshold,
-                tolerance=self.tolerance,
-            ),
-            expected,
-        )
+        # test nothing fails - noise never stays within the tolerance
+        cases = {
+            "negative": (np.negative(to_float_array(arr)), expected),
+            "noise": (self.noise, np.ones(len(self.times))),
+        }
+        for name, (inp, case_expected) in cases.items():
+            with self.subTest(inp=name):
+                assert_flags_equal(
+                    qartod.flat_line_test(
+                        inp=inp,
+                        tinp=self.times,
+                        suspect_threshold=self.suspect_threshold,
+                        fail_threshold=self.fail_threshold,
+                        tolerance=self.tolerance,
+                    ),
+                    case_expected,
+                )
 
         # test empty array - should return empty result
-        arr = np.array([])
-        expected = np.array([])
-        npt.assert_array_equal(
+        assert_flags_equal(
             qartod.flat_line_test(
-                inp=arr,
+                inp=np.array([]),
                 tinp=self.times,
                 suspect_threshold=self.suspect_threshold,
                 fail_threshold=self.fail_threshold,
                 tolerance=self.tolerance,
             ),
-            expected,
-        )
-
-        # test nothing fails
-        rng = np.random.default_rng()
-        arr = rng.normal(size=len(self.times))
-        expected = np.ones_like(arr)
-        npt.assert_array_equal(
-            qartod.flat_line_test(
-                inp=arr,
-                tinp=self.times,
-                suspect_threshold=self.suspect_threshold,
-                fail_threshold=self.fail_threshold,
-                tolerance=0.00000000001,
-            ),
-            expected,
-        )
+            np.array([]),
+        )
+
+    def test_flat_line_kernel(self):
+        kernel = python_kernel(qartod._flat_line_kernel)
+
+        def run_kernel(row, count, tolerance):
+            flat = np.zeros(row.size, dtype=bool)
+            kernel(row, count, tolerance, flat)
+            return flat
+
+        values = self.kernel_values
+        expected = self._flat_line_oracle(values, self.tolerance)
+        for name, find_flat in (("kernel", run_kernel), ("filter", qartod._flat_line_filter)):
+            with self.subTest(implementation=name):
+                for row, row_expected in zip(values, expected):
+                    flags = np.full(row.size, qartod.QartodFlags.GOOD, dtype=np.uint8)
+                    for count, flag in (
+                        (3, qartod.QartodFlags.SUSPECT),
+                        (5, qartod.QartodFlags.FAIL),
+                    ):
+                        flags[find_flat(row, count, self.tolerance)] = flag
+                    flags[np.isnan(row)] = qartod.QartodFlags.MISSING
+                    assert_flags_equal(flags, row_expected)
 
     def test_flat_line_starting_from_beginning(self):
         arr = [
@@ -1508,23 +1192,8 @@ class QartodFlatLineTest(unittest.TestCase):
             3.0005,
             3.00001,
         ]
-        expected = [1, 1, 1, 3, 3, 4, 4, 1, 1, 1, 1, 1, 3]
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            inputs = [
-                arr,
-                np.asarray(arr, dtype=np.float64),
-                dask_arr(np.asarray(arr, dtype=np.float64)),
-            ]
-        for i in inputs:
-            result = qartod.flat_line_test(
-                inp=i,
-                tinp=self.times,
-                suspect_threshold=self.suspect_threshold,
-                fail_threshold=self.fail_threshold,
-                tolerance=self.tolerance,
-            )
-            npt.assert_array_equal(result, expected)
+        expected = np.array([1, 1, 1, 3, 3, 4, 4, 1, 1, 1, 1, 1, 3], dtype=np.int8)
+        self._run_flat_line_variants(arr, expected)
 
     def test_flat_line_short_timeseries(self):
         def check(time, arr, expected):
@@ -1535,23 +1204,25 @@ class QartodFlatLineTest(unittest.TestCase):
                 fail_threshold=5,
                 tolerance=0.1,
             )
-            npt.assert_array_equal(result, expected)
+            assert_flags_equal(result, expected)
 
+        # Fewer than 3 points take the early return, so check those directly
         check(time=[], arr=[], expected=[])
         check(time=[0], arr=[5], expected=[1])
         check(time=[0, 1], arr=[5, 5], expected=[1, 1])
-        check(time=[0, 1, 2], arr=[5, 5, 5], expected=[1, 1, 1])
-        check(time=[0, 1, 2, 3], arr=[5, 5, 5, 5], expected=[1, 1, 1, 3])
-        check(
-            time=[0, 1, 2, 3, 4],
-            arr=[5, 5, 5, 5, 5],
-            expected=[1, 1, 1, 3, 3],
-        )
-        check(
-            time=[0, 1, 2, 3, 4, 5],
-            arr=[5, 5, 5, 5, 5, 5],
-            expected=[1, 1, 1, 3, 3, 4],
+
+        # Flags only look backwards, so every longer series is a prefix of the full one
+        result = qartod.flat_line_test(
+            inp=np.full(6, 5.0),
+            tinp=np.arange(6),
+            suspect_threshold=3,
+            fail_threshold=5,
+            tolerance=0.1,
         )
+        expected = np.array([1, 1, 1, 3, 3, 4], dtype=np.int8)
+        for k in range(3, 7):
+            with self.subTest(length=k):
+                assert_flags_equal(result[:k], expected[:k])
 
     def test_flat_line_with_spike(self):
         tolerance = 4
@@ -1559,7 +1230,7 @@ class QartodFlatLineTest(unittest.TestCase):
         fail_threshold = 6
         time = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
         arr = [1, 1, 1, 1, 1, 6, 5, 4, 3, 2]
-        expected = [1, 1, 1, 3, 3, 1, 1, 1, 3, 3]
+        expected = np.array([1, 1, 1, 3, 3, 1, 1, 1, 3, 3], dtype=np.int8)
         result = qartod.flat_line_test(
             inp=arr,
             tinp=time,
@@ -1567,7 +1238,7 @@ class QartodFlatLineTest(unittest.TestCase):
             fail_threshold=fail_threshold,
             tolerance=tolerance,
         )
-        npt.assert_array_equal(result, expected)
+        assert_flags_equal(result, expected)
 
     def test_flat_line_missing_values(self):
         arr = [
@@ -1586,23 +1257,8 @@ class QartodFlatLineTest(unittest.TestCase):
             None,
             3.00001,
         ]
-        expected = [1, 9, 9, 1, 3, 3, 4, 4, 1, 9, 1, 9, 9, 3]
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            inputs = [
-                arr,
-                np.asarray(arr, dtype=np.float64),
-                dask_arr(np.asarray(arr, dtype=np.float64)),
-            ]
-        for i in inputs:
-            result = qartod.flat_line_test(
-                inp=i,
-                tinp=self.times,
-                suspect_threshold=self.suspect_threshold,
-                fail_threshold=self.fail_threshold,
-                tolerance=self.tolerance,
-            )
-            npt.assert_array_equal(result, expected)
+        expected = np.array([1, 9, 9, 1, 3, 3, 4, 4, 1, 9, 1, 9, 9, 3], dtype=np.int8)
+        self._run_flat_line_variants(arr, expected)
 
 
 class QartodAttenuatedSignalTest(unittest.TestCase):
@@ -1618,43 +1274,32 @@ class QartodAttenuatedSignalTest(unittest.TestCase):
         min_obs=None,
         min_period=None,
     ):
-        npt.assert_array_equal(
-            qartod.attenuated_signal_test(
-                inp=signal,
-                tinp=times,
-                suspect_threshold=suspect_threshold,
-                fail_threshold=fail_threshold,
-                test_period=test_period,
-                min_obs=min_obs,
-                min_period=min_period,
-                check_type=check_type,
-            ),
+        kwargs = {
+            "inp": signal,
+            "suspect_threshold": suspect_threshold,
+            "fail_threshold": fail_threshold,
+            "test_period": test_period,
+            "min_obs": min_obs,
+            "min_period": min_period,
+            "check_type": check_type,
+        }
+        assert_flags_equal(
+            qartod.attenuated_signal_test(tinp=times, **kwargs),
             expected,
         )
 
         # test epoch secs - should return same result
-        times_epoch_secs = [np.datetime64(t, "s").astype(int) for t in times]
-        npt.assert_array_equal(
-            qartod.attenuated_signal_test(
-                inp=signal,
-                tinp=times_epoch_secs,
-                suspect_threshold=suspect_threshold,
-                fail_threshold=fail_threshold,
-                test_period=test_period,
-                min_obs=min_obs,
-                min_period=min_period,
-                check_type=check_type,
-            ),
+        times_epoch_secs = np.asarray(times, dtype="datetime64[s]").astype(np.int64)
+        assert_flags_equal(
+            qartod.attenuated_signal_test(tinp=times_epoch_secs, **kwargs),
             expected,
         )
 
     def test_attenuated_signal(self):
         # good signal, all pass
         signal = np.array([1, 2, 3, 4])
-        times = np.array(
-            [np.datetime64("2019-01-01") + np.timedelta64(i, "D") for i in range(signal.size)],
-        )
-        expected = np.array([1, 1, 1, 1])
+        times = daily_times(signal.size)
+        expected = PASS4
         self._run_test(
             times=times,
             signal=signal,
@@ -1666,10 +1311,8 @@ class QartodAttenuatedSignalTest(unittest.TestCase):
 
         # Only suspect
         signal = np.array([1, 2, 3, 4])
-        times = np.array(
-            [np.datetime64("2019-01-01") + np.timedelta64(i, "D") for i in range(signal.size)],
-        )
-        expected = np.array([3, 3, 3, 3])
+        times = daily_times(signal.size)
+        expected = SUSPECT4
         self._run_test(
             times=times,
             signal=signal,
@@ -1681,10 +1324,8 @@ class QartodAttenuatedSignalTest(unittest.TestCase):
 
         # Not changing should fail
         signal = np.array([1, 1, 1, 1])
-        times = np.array(
-            [np.datetime64("2019-01-01") + np.timedelta64(i, "D") for i in range(signal.size)],
-        )
-        expected = np.array([4, 4, 4, 4])
+        times = daily_times(signal.size)
+        expected = FAIL4
         self._run_test(
             times=times,
             signal=signal,
@@ -1696,10 +1337,8 @@ class QartodAttenuatedSignalTest(unittest.TestCase):
 
         # std deviation less than fail threshold
         signal = np.array([10, 20, 30, 40])
-        times = np.array(
-            [np.datetime64("2019-01-01") + np.timedelta64(i, "D") for i in range(signal.size)],
-        )
-        expected = np.array([4, 4, 4, 4])
+        times = daily_times(signal.size)
+        expected = FAIL4
         self._run_test(
             times=times,
             signal=signal,
@@ -1712,10 +1351,8 @@ class QartodAttenuatedSignalTest(unittest.TestCase):
     def test_attenuated_signal_range(self):
         # range less than fail threshold
         signal = np.array([10, 20, 30, 40])
-        times = np.array(
-            [np.datetime64("2019-01-01") + np.timedelta64(i, "D") for i in range(signal.size)],
-        )
-        expected = np.array([4, 4, 4, 4])
+        times = daily_times(signal.size)
+        expected = FAIL4
         self._run_test(
             times=times,
             signal=signal,
@@ -1727,10 +1364,8 @@ class QartodAttenuatedSignalTest(unittest.TestCase):
 
         # range less than suspect threshold
         signal = np.array([10, 20, 30, 40])
-        times = np.array(
-            [np.datetime64("2019-01-01") + np.timedelta64(i, "D") for i in range(signal.size)],
-        )
-        expected = np.array([3, 3, 3, 3])
+        times = daily_times(signal.size)
+        expected = SUSPECT4
         self._run_test(
             times=times,
             signal=signal,
@@ -1741,10 +1376,8 @@ class QartodAttenuatedSignalTest(unittest.TestCase):
         )
 
         signal = np.array([3, 4, 5, 8.1, 9, 8.5, 8.7, 8.4, 8.2, 8.35, 2, 1])
-        times = np.array(
-            [np.datetime64("2019-01-01") + np.timedelta64(i, "D") for i in range(signal.size)],
-        )
-        expected = np.array([1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1])
+        times = daily_times(signal.size)
+        expected = np.array([1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], dtype=np.int8)
         self._run_test(
             times=times,
             signal=signal,
@@ -1757,9 +1390,7 @@ class QartodAttenuatedSignalTest(unittest.TestCase):
     def test_attenuated_signal_time_window(self):
         # test time windowed range
         signal = [1, 2, 3, 100, 1000]
-        times = np.array(
-            [np.datetime64("2019-01-01") + np.timedelta64(i, "D") for i in range(len(signal))],
-        )
+        times = daily_times(len(signal))
         time_window = 2 * 86400  # 2 days
 
         def _run_test_time_window(min_obs, min_period, expected):
@@ -1778,33 +1409,31 @@ class QartodAttenuatedSignalTest(unittest.TestCase):
         # zero min_obs -- initial values should fail
         min_obs = 0
         min_period = None
-        expected = [4, 4, 4, 3, 1]
+        expected = np.array([4, 4, 4, 3, 1], dtype=np.int8)
         _run_test_time_window(min_obs, min_period, expected)
 
         # zero min_period -- initial values should fail
         min_obs = None
         min_period = 0
-        expected = [4, 4, 4, 3, 1]
+        expected = np.array([4, 4, 4, 3, 1], dtype=np.int8)
         _run_test_time_window(min_obs, min_period, expected)
 
         # min_obs the same size as time_window -- first window should be UNKNOWN
         min_obs = 2  # 2 days (since 1 obs per day)
         min_period = None
-        expected = [2, 4, 4, 3, 1]
+        expected = np.array([2, 4, 4, 3, 1], dtype=np.int8)
         _run_test_time_window(min_obs, min_period, expected)
 
         # min_period the same size as time_window -- first window should be UNKNOWN
         min_obs = None
         min_period = time_window
-        expected = [2, 4, 4, 3, 1]
+        expected = np.array([2, 4, 4, 3, 1], dtype=np.int8)
         _run_test_time_window(min_obs, min_period, expected)
 
     def test_attenuated_signal_missing(self):
-        signal = np.array([None, 2, 3, 4])
-        times = np.array(
-            [np.datetime64("2019-01-01") + np.timedelta64(i, "D") for i in range(signal.size)],
-        )
-        expected = np.array([9, 1, 1, 1])
+        signal = np.array([np.nan, 2, 3, 4], dtype=np.float64)
+        times = daily_times(signal.size)
+        expected = np.array([9, 1, 1, 1], dtype=np.int8)
         self._run_test(
             times=times,
             signal=signal,
@@ -1814,11 +1443,9 @@ class QartodAttenuatedSignalTest(unittest.TestCase):
             expected=expected,
         )
 
-        signal = np.array([None, None, None, None])
-        times = np.array(
-            [np.datetime64("2019-01-01") + np.timedelta64(i, "D") for i in range(signal.size)],
-        )
-        expected = np.array([9, 9, 9, 9])
+        signal = np.full(4, np.nan)
+        times = daily_times(signal.size)
+        expected = MISSING4
         self._run_test(
             times=times,
             signal=signal,
@@ -1830,10 +1457,8 @@ class QartodAttenuatedSignalTest(unittest.TestCase):
 
         # range less than 30
         signal = [10, None, None, 40]
-        times = np.array(
-            [np.datetime64("2019-01-01") + np.timedelta64(i, "D") for i in range(len(signal))],
-        )
-        expected = np.array([4, 9, 9, 4])
+        times = daily_times(len(signal))
+        expected = np.array([4, 9, 9, 4], dtype=np.int8)
         self._run_test(
             times=times,
             signal=signal,
@@ -1846,14 +1471,12 @@ class QartodAttenuatedSignalTest(unittest.TestCase):
     def test_attenuated_signal_missing_time_window(self):
         # test time windowed range with missing values
         signal = [1, None, 10, 100, 1000]
-        times = np.array(
-            [np.datetime64("2019-01-01") + np.timedelta64(i, "D") for i in range(len(signal))],
-        )
+        times = daily_times(len(signal))
         time_window = 2 * 86400  # 2 days
         min_obs = 2  # 2 days (since 1 obs per day)
 
         # test time windowed range
-        expected = [2, 9, 2, 3, 1]
+        expected = np.array([2, 9, 2, 3, 1], dtype=np.int8)
         self._run_test(
             times=times,
             signal=signal,
@@ -1866,7 +1489,7 @@ class QartodAttenuatedSignalTest(unittest.TestCase):
         )
 
         # test time windowed std
-        expected = [2, 9, 2, 3, 1]
+        expected = np.array([2, 9, 2, 3, 1], dtype=np.int8)
         time_window = 2 * 86400
         self._run_test(
             times=times,
@@ -1889,31 +1512,39 @@ class QartodDensityInversionTest(unittest.TestCase):
         suspect_threshold=-0.01,
         fail_threshold=-0.03,
     ):
-        # Try every possible input format combinations
-        dens_inputs = [
-            density,
-            np.asarray(density, dtype=np.float64),
-            dask_arr(np.asarray(density, dtype=np.float64)),
-        ]
-
-        depth_inputs = [
-            depth,
-            np.asarray(depth, dtype=np.float64),
-            dask_arr(np.asarray(depth, dtype=np.float64)),
-        ]
-
-        for rho in dens_inputs:
-            for z in depth_inputs:
-                npt.assert_array_equal(
+        # Each backend paired with itself, plus one mixed pair. The inputs are
+        # converted independently, so the full cross product adds nothing
+        dens_inputs = input_variants(density)
+        depth_inputs = input_variants(depth)
+        pairs = [(backend, backend) for backend in dens_inputs]
+        pairs.append(("numpy", "list"))
+        for rho_backend, z_backend in pairs:
+            with self.subTest(inp=rho_backend, zinp=z_backend):
+                assert_flags_equal(
                     qartod.density_inversion_test(
-                        inp=rho,
-                        zinp=z,
+                        inp=dens_inputs[rho_backend],
+                        zinp=depth_inputs[z_backend],
                         suspect_threshold=suspect_threshold,
                         fail_threshold=fail_threshold,
                     ),
                     result,
                 )
 
+    def test_density_inversion_kernel(self):
+        kernel = python_kernel(qartod._density_inversion_kernel)
+        density = np.array([1024, 1023.98, 1024, 1023.9, np.nan, 1025])
+        depth = np.array([1, 2, 3, 4, 5, 6], dtype=np.float64)
+        marks = np.zeros((3, density.size), dtype=bool)
+        kernel(density, depth, -0.01, -0.05, marks)
+        assert_flags_equal(
+            marks,
+            [
+                [True, True, True, True, False, False],
+                [False, False, True, True, False, False],
+                [False, False, False, False, True, True],
+            ],
+        )
+
     def test_density_inversion_downcast_flags(self):
         depth = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12]
         density = [
@@ -1930,7 +1561,7 @@ class QartodDensityInversionTest(unittest.TestCase):
             1026,
             1027,
         ]
-        result = [1, 3, 3, 1, 1, 4, 4, 1, 1, 9, 9, 1]
+        result = np.array([1, 3, 3, 1, 1, 4, 4, 1, 1, 9, 9, 1], dtype=np.int8)
         self._run_density_inversion_tests(density, depth, result)
 
     def test_density_inversion_upcast_flags(self):
@@ -1948,7 +1579,7 @@ class QartodDensityInversionTest(unittest.TestCase):
             1024,
             1024,
         ]
-        result = [1, 9, 9, 1, 4, 4, 1, 1, 3, 3, 1]
+        result = np.array([1, 9, 9, 1, 4, 4, 1, 1, 3, 3, 1], dtype=np.int8)
         self._run_density_inversion_tests(density, depth, result)
 
     def test_density_inversion_down_up_cast_flags(self):
@@ -1973,7 +1604,7 @@ class QartodDensityInversionTest(unittest.TestCase):
             1024,
             1024,
         ]
-        result = [1, 3, 3, 1, 1, 4, 4, 1, 1, 1, 1, 4, 4, 1, 1, 3, 3, 1]
+        result = np.array([1, 3, 3, 1, 1, 4, 4, 1, 1, 1, 1, 4, 4, 1, 1, 3, 3, 1], dtype=np.int8)
         self._run_density_inversion_tests(density, depth, result)
 
     def test_density_inversion_stable_depth_flags(self):
@@ -1991,21 +1622,21 @@ class QartodDensityInversionTest(unittest.TestCase):
             1024,
             1024,
         ]
-        result = [1, 9, 9, 1, 1, 1, 1, 1, 1, 1, 1]
+        result = np.array([1, 9, 9, 1, 1, 1, 1, 1, 1, 1, 1], dtype=np.int8)
         self._run_density_inversion_tests(density, depth, result)
 
     def test_density_inversion_one_record_input(self):
         # One Value test
         depth = [1]
         density = [1026]
-        result = [2]
+        result = np.array([2], dtype=np.int8)
         self._run_density_inversion_tests(density, depth, result)
 
     def test_density_inversion_bad_depth_value(self):
         # Missing depth value
         depth = [1, None, 3, 4, 5]
         density = [1025, 1025, 1025, 1026, 1026]
-        result = [1, 9, 9, 1, 1]
+        result = np.array([1, 9, 9, 1, 1], dtype=np.int8)
         self._run_density_inversion_tests(density, depth, result)
 
     def test_density_inversion_input(self):
@@ -2059,9 +1690,9 @@ class QartodDensityInversionTest(unittest.TestCase):
 class QartodUtilsTests(unittest.TestCase):
     def test_qartod_compare(self):
         """Tests that the compare function works as intended."""
-        range_flags = np.array([1, 1, 1, 9, 1, 1, 9, 9])
-        spike_flags = np.array([2, 1, 1, 1, 1, 1, 9, 9])
-        grdtn_flags = np.array([1, 3, 3, 4, 3, 1, 2, 9])
+        range_flags = np.array([1, 1, 1, 9, 1, 1, 9, 9], dtype=np.int8)
+        spike_flags = np.array([2, 1, 1, 1, 1, 1, 9, 9], dtype=np.int8)
+        grdtn_flags = np.array([1, 3, 3, 4, 3, 1, 2, 9], dtype=np.int8)
 
         primary_flags = qartod.qartod_compare(
             [
@@ -2072,5 +1703,5 @@ class QartodUtilsTests(unittest.TestCase):
         )
         np.testing.assert_array_equal(
             primary_flags,
-            np.array([1, 3, 3, 4, 3, 1, 2, 9]),
+            np.array([1, 3, 3, 4, 3, 1, 2, 9], dtype=np.int8),
         )
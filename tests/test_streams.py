@@ -20,8 +20,54 @@ L.setLevel(logging.INFO)
 L.handlers = [logging.StreamHandler()]
 
 
+def read_only(arr):
+    """Return ``arr`` after making it read-only, so shared fixtures cannot be changed."""
+    arr.setflags(write=False)
+    return arr
+
+
+# Every stream test checks 50 daily values, 0-49, from a fixed location.
+# Built once here and shared read-only by the test classes.
+ROWS = 50
+TIMES = pd.date_range(start="01/01/2020", periods=ROWS, freq="D")
+VARDATA = read_only(np.arange(0, ROWS, dtype=np.float64))
+Z = read_only(np.full(ROWS, 2.0, dtype=np.float64))
+LAT = read_only(np.full(ROWS, 36.1, dtype=np.float64))
+LON = read_only(np.full(ROWS, -76.5, dtype=np.float64))
+COLUMNS = {"z": Z, "lat": LAT, "lon": LON, "variable1": VARDATA}
+
+# gross_range_test flags for VARDATA with suspect_span [20, 30] and fail_span [10, 40].
+# 0-9 fail, 10-19 suspect, 20-30 pass, 31-40 suspect and 41-49 fail. The
+# spans are inclusive, so 30 passes and 40 is suspect.
+GROSS_RANGE_FLAGS = read_only(
+    np.repeat(np.array([4, 3, 1, 3, 4], dtype=np.int8), [10, 10, 11, 10, 9]),
+)
+
+# gross_range_test flags for the eight values around the many context spans, such as
+# 0-7 with suspect_span [3, 4] and fail_span [2, 5]. Everything else in those
+# contexts fails.
+SPAN_EDGE_FLAGS = read_only(np.array([4, 4, 3, 1, 1, 3, 4, 4], dtype=np.int8))
+STREAM_DF = pd.DataFrame({"time": TIMES, **COLUMNS})
+
+
+def stream_dataset(dim="time", **variables):
+    """Return the shared stream data, plus any extra ``variables``, as a Dataset along ``dim``.
+
+    Built straight from the arrays, giving the same Dataset as ``xr.Dataset.from_dataframe``.
+    When ``dim`` is not "time", time is a data variable along a default integer index.
+    """
+    columns = {**COLUMNS, **variables}
+    if dim == "time":
+        coords = {"time": TIMES}
+    else:
+        coords = {dim: np.arange(ROWS)}
+        columns = {"time": TIMES, **columns}
+    return xr.Dataset({name: (dim, values) for name, values in columns.items()}, coords=coords)
+
+
 class PandasStreamTest(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         config = """
             region: something
             window:
@@ -34,55 +80,24 @@ class PandasStreamTest(unittest.TestCase):
                             suspect_span: [20, 30]
                             fail_span: [10, 40]
         """
-        self.config = Config(config)
-
-        rows = 50
-        data_inputs = {
-            "time": pd.date_range(start="01/01/2020", periods=rows, freq="D"),
-            "z": np.array(2.0),
-            "lat": np.array(36.1),
-            "lon": np.array(-76.5),
-            "variable1": np.arange(0, rows),
-        }
-        self.df = pd.DataFrame(data_inputs)
+        cls.config = Config(config)
+
+        cls.df = STREAM_DF
 
     def test_run(self):
         ps = PandasStream(self.df)
         raw_results = ps.run(self.config)
         results = collect_results(raw_results, how="dict")
 
-        # First ten (0-9 values) fail
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][0:10],
-            np.array([4, 4, 4, 4, 4, 4, 4, 4, 4, 4]),
-        )
-
-        # Next ten (10-19 values) suspect
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][10:20],
-            np.array([3, 3, 3, 3, 3, 3, 3, 3, 3, 3]),
-        )
-        # Next ten (20-29 values) pass
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][20:30],
-            np.array([1, 1, 1, 1, 1, 1, 1, 1, 1, 1]),
-        )
-        # Next ten, first value (30) pass becuasethe test is inclusive
-        # and (31-39 values) suspect
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][30:40],
-            np.array([1, 3, 3, 3, 3, 3, 3, 3, 3, 3]),
-        )
-        # Next ten, first value (40) suspect becuasethe test is inclusive
-        # and (41-49 values) fail
         npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][40:50],
-            np.array([3, 4, 4, 4, 4, 4, 4, 4, 4, 4]),
+            results["variable1"]["qartod"]["gross_range_test"],
+            GROSS_RANGE_FLAGS,
         )
 
 
 class NumpyStreamTestLightConfig(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         config = """
             streams:
                 variable1:
@@ -91,57 +106,28 @@ class NumpyStreamTestLightConfig(unittest.TestCase):
                             suspect_span: [20, 30]
                             fail_span: [10, 40]
         """
-        self.config = Config(config)
-
-        rows = 50
-        self.tinp = pd.date_range(
-            start="01/01/2020",
-            periods=rows,
-            freq="D",
-        ).to_numpy()
-        self.zinp = np.full_like(self.tinp, 2.0)
-        self.lat = np.full_like(self.tinp, 36.1)
-        self.lon = np.full_like(self.tinp, -76.5)
+        cls.config = Config(config)
+
+        cls.tinp = TIMES.to_numpy()
+        cls.zinp = Z
+        cls.lat = LAT
+        cls.lon = LON
 
     def test_run(self):
         # Input is the values 0-49, easy testing
-        inp = np.arange(0, self.tinp.size)
-
-        ns = NumpyStream(inp, self.tinp, self.zinp, self.lat, self.lon)
+        ns = NumpyStream(VARDATA, self.tinp, self.zinp, self.lat, self.lon)
         results = ns.run(self.config)
         results = collect_results(results, how="dict")
 
-        # First ten (0-9 values) fail
         npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][0:10],
-            np.array([4, 4, 4, 4, 4, 4, 4, 4, 4, 4]),
-        )
-        # Next ten (10-19 values) suspect
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][10:20],
-            np.array([3, 3, 3, 3, 3, 3, 3, 3, 3, 3]),
-        )
-        # Next ten (20-29 values) pass
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][20:30],
-            np.array([1, 1, 1, 1, 1, 1, 1, 1, 1, 1]),
-        )
-        # Next ten, first value (30) pass because the test is inclusive
-        # and (31-39 values) suspect
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][30:40],
-            np.array([1, 3, 3, 3, 3, 3, 3, 3, 3, 3]),
-        )
-        # Next ten, first value (40) suspect because the test is inclusive
-        # and (41-49 values) fail
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][40:50],
-            np.array([3, 4, 4, 4, 4, 4, 4, 4, 4, 4]),
+            results["variable1"]["qartod"]["gross_range_test"],
+            GROSS_RANGE_FLAGS,
         )
 
 
 class NumpyStreamTest(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         config = """
             region: something
             window:
@@ -154,57 +140,29 @@ class NumpyStreamTest(unittest.TestCase):
                             suspect_span: [20, 30]
                             fail_span: [10, 40]
         """
-        self.config = Config(config)
-
-        rows = 50
-        self.tinp = pd.date_range(
-            start="01/01/2020",
-            periods=rows,
-            freq="D",
-        ).to_numpy()
-        self.zinp = np.full_like(self.tinp, 2.0)
-        self.lat = np.full_like(self.tinp, 36.1)
-        self.lon = np.full_like(self.tinp, -76.5)
+        cls.config = Config(config)
+
+        cls.tinp = TIMES.to_numpy()
+        # A stationary stream, each single value is viewed once per time without a copy
+        cls.zinp = np.broadcast_to(2.0, ROWS)
+        cls.lat = np.broadcast_to(36.1, ROWS)
+        cls.lon = np.broadcast_to(-76.5, ROWS)
 
     def test_run(self):
         # Input is the values 0-49, easy testing
-        inp = np.arange(0, self.tinp.size)
-
-        ns = NumpyStream(inp, self.tinp, self.zinp, self.lat, self.lon)
+        ns = NumpyStream(VARDATA, self.tinp, self.zinp, self.lat, self.lon)
         results = ns.run(self.config)
         results = collect_results(results, how="dict")
 
-        # First ten (0-9 values) fail
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][0:10],
-            np.array([4, 4, 4, 4, 4, 4, 4, 4, 4, 4]),
-        )
-        # Next ten (10-19 values) suspect
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][10:20],
-            np.array([3, 3, 3, 3, 3, 3, 3, 3, 3, 3]),
-        )
-        # Next ten (20-29 values) pass
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][20:30],
-            np.array([1, 1, 1, 1, 1, 1, 1, 1, 1, 1]),
-        )
-        # Next ten, first value (30) pass because the test is inclusive
-        # and (31-39 values) suspect
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][30:40],
-            np.array([1, 3, 3, 3, 3, 3, 3, 3, 3, 3]),
-        )
-        # Next ten, first value (40) suspect because the test is inclusive
-        # and (41-49 values) fail
         npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][40:50],
-            np.array([3, 4, 4, 4, 4, 4, 4, 4, 4, 4]),
+            results["variable1"]["qartod"]["gross_range_test"],
+            GROSS_RANGE_FLAGS,
         )
 
 
 class NetcdfStreamTest(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         config = """
             region: something
             window:
@@ -217,58 +175,28 @@ class NetcdfStreamTest(unittest.TestCase):
                             suspect_span: [20, 30]
                             fail_span: [10, 40]
         """
-        self.config = Config(config)
-
-        rows = 50
-        data_inputs = {
-            "time": pd.date_range(start="01/01/2020", periods=rows, freq="D"),
-            "z": np.array(2.0),
-            "lat": np.array(36.1),
-            "lon": np.array(-76.5),
-            "variable1": np.arange(0, rows),
-        }
-        df = pd.DataFrame(data_inputs)
-        self.ds = xr.Dataset.from_dataframe(df)
-
-    def tearDown(self):
-        self.ds.close()
+        cls.config = Config(config)
+
+        cls.ds = stream_dataset("index")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.ds.close()
 
     def test_run(self):
         ns = NetcdfStream(self.ds)
         results = ns.run(self.config)
         results = collect_results(results, how="dict")
 
-        # First ten (0-9 values) fail
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][0:10],
-            np.array([4, 4, 4, 4, 4, 4, 4, 4, 4, 4]),
-        )
-        # Next ten (10-19 values) suspect
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][10:20],
-            np.array([3, 3, 3, 3, 3, 3, 3, 3, 3, 3]),
-        )
-        # Next ten (20-29 values) pass
         npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][20:30],
-            np.array([1, 1, 1, 1, 1, 1, 1, 1, 1, 1]),
-        )
-        # Next ten, first value (30) pass because the test is inclusive
-        # and (31-39 values) suspect
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][30:40],
-            np.array([1, 3, 3, 3, 3, 3, 3, 3, 3, 3]),
-        )
-        # Next ten, first value (40) suspect because the test is inclusive
-        # and (41-49 values) fail
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][40:50],
-            np.array([3, 4, 4, 4, 4, 4, 4, 4, 4, 4]),
+            results["variable1"]["qartod"]["gross_range_test"],
+            GROSS_RANGE_FLAGS,
         )
 
 
 class XarrayStreamTest(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         config = """
             region: something
             window:
@@ -281,58 +209,28 @@ class XarrayStreamTest(unittest.TestCase):
                             suspect_span: [20, 30]
                             fail_span: [10, 40]
         """
-        self.config = Config(config)
-
-        rows = 50
-        data_inputs = {
-            "time": pd.date_range(start="01/01/2020", periods=rows, freq="D"),
-            "z": np.array(2.0),
-            "lat": np.array(36.1),
-            "lon": np.array(-76.5),
-            "variable1": np.arange(0, rows),
-        }
-        df = pd.DataFrame(data_inputs).set_index("time")
-        self.ds = xr.Dataset.from_dataframe(df)
-
-    def tearDown(self):
-        self.ds.close()
+        cls.config = Config(config)
+
+        cls.ds = stream_dataset()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.ds.close()
 
     def test_run(self):
         xs = XarrayStream(self.ds)
         results = xs.run(self.config)
         results = collect_results(results, how="dict")
 
-        # First ten (0-9 values) fail
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][0:10],
-            np.array([4, 4, 4, 4, 4, 4, 4, 4, 4, 4]),
-        )
-        # Next ten (10-19 values) suspect
         npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][10:20],
-            np.array([3, 3, 3, 3, 3, 3, 3, 3, 3, 3]),
-        )
-        # Next ten (20-29 values) pass
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][20:30],
-            np.array([1, 1, 1, 1, 1, 1, 1, 1, 1, 1]),
-        )
-        # Next ten, first value (30) pass because the test is inclusive
-        # and (31-39 values) suspect
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][30:40],
-            np.array([1, 3, 3, 3, 3, 3, 3, 3, 3, 3]),
-        )
-        # Next ten, first value (40) suspect because the test is inclusive
-        # and (41-49 values) fail
-        npt.assert_array_equal(
-            results["variable1"]["qartod"]["gross_range_test"][40:50],
-            np.array([3, 4, 4, 4, 4, 4, 4, 4, 4, 4]),
+            results["variable1"]["qartod"]["gross_range_test"],
+            GROSS_RANGE_FLAGS,
         )
 
 
 class XarrayStreamManyContextTest(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         config = """
             contexts:
                 -   region: something
@@ -366,60 +264,51 @@ class XarrayStreamManyContextTest(unittest.TestCase):
                                     suspect_span: [23, 24]
                                     fail_span: [22, 25]
         """
-        self.config = Config(config)
-
-        rows = 50
-        self.vardata = np.arange(0, rows)
-        data_inputs = {
-            "time": pd.date_range(start="01/01/2020", periods=rows, freq="D"),
-            "z": np.array(2.0),
-            "lat": np.array(36.1),
-            "lon": np.array(-76.5),
-            "variable1": self.vardata,
-            "variable2": self.vardata,
-        }
-        df = pd.DataFrame(data_inputs).set_index("time")
-        self.ds = xr.Dataset.from_dataframe(df)
-
-    def tearDown(self):
-        self.ds.close()
+        cls.config = Config(config)
+
+        cls.ds = stream_dataset(variable2=VARDATA)
+        # Run the stream once, the tests only collect its results
+        cls.results = list(XarrayStream(cls.ds).run(cls.config))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.ds.close()
 
     def test_run_dict_results(self):
-        xs = XarrayStream(self.ds)
-        results = xs.run(self.config)
-        results = collect_results(results, how="dict")
+        results = collect_results(self.results, how="dict")
 
         # Variable 1
         npt.assert_array_equal(
             results["variable1"]["qartod"]["gross_range_test"][0:8],
-            np.array([4, 4, 3, 1, 1, 3, 4, 4]),
+            SPAN_EDGE_FLAGS,
         )
         npt.assert_array_equal(
             results["variable1"]["qartod"]["gross_range_test"][8:40],
-            np.full((32,), 4),
+            4,
         )
         npt.assert_array_equal(
             results["variable1"]["qartod"]["gross_range_test"][40:48],
-            np.array([4, 4, 3, 1, 1, 3, 4, 4]),
+            SPAN_EDGE_FLAGS,
         )
 
         # Variable 2
         npt.assert_array_equal(
             results["variable2"]["qartod"]["gross_range_test"][0:20],
-            np.full((20,), 4),
+            4,
         )
         npt.assert_array_equal(
             results["variable2"]["qartod"]["gross_range_test"][20:28],
-            np.array([4, 4, 3, 1, 1, 3, 4, 4]),
+            SPAN_EDGE_FLAGS,
         )
         npt.assert_array_equal(
             results["variable2"]["qartod"]["gross_range_test"][28:50],
-            np.full((22,), 4),
+            4,
         )
 
 
 class PandasStreamManyContextTest(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         config = """
             contexts:
                 -   region: something
@@ -453,57 +342,59 @@ class PandasStreamManyContextTest(unittest.TestCase):
                                     suspect_span: [23, 24]
                                     fail_span: [22, 25]
         """
-        self.config = Config(config)
-
-        rows = 50
-        self.vardata = np.arange(0, rows)
-        data_inputs = {
-            "time": pd.date_range(start="01/01/2020", periods=rows, freq="D"),
-            "z": np.array(2.0),
-            "lat": np.array(36.1),
-            "lon": np.array(-76.5),
-            "variable1": self.vardata,
-            "variable2": self.vardata,
-        }
-        self.df = pd.DataFrame(data_inputs)
+        cls.config = Config(config)
+
+        cls.df = STREAM_DF.assign(variable2=VARDATA)
+        # Run the stream once, the tests only collect its results
+        cls.results = list(PandasStream(cls.df).run(cls.config))
 
     def test_run_dict_results(self):
-        ps = PandasStream(self.df)
-        results = ps.run(self.config)
-        results = collect_results(results, how="dict")
+        results = collect_results(self.results, how="dict")
 
         # Variable 1
         npt.assert_array_equal(
             results["variable1"]["qartod"]["gross_range_test"][0:8],
-            np.array([4, 4, 3, 1, 1, 3, 4, 4]),
+            SPAN_EDGE_FLAGS,
         )
         npt.assert_array_equal(
             results["variable1"]["qartod"]["gross_range_test"][8:40],
-            np.full((32,), 4),
+            4,
         )
         npt.assert_array_equal(
             results["variable1"]["qartod"]["gross_range_test"][40:48],
-            np.array([4, 4, 3, 1, 1, 3, 4, 4]),
+            SPAN_EDGE_FLAGS,
         )
 
         # Variable 2
         npt.assert_array_equal(
             results["variable2"]["qartod"]["gross_range_test"][0:20],
-            np.full((20,), 4),
+            4,
         )
         npt.assert_array_equal(
             results["variable2"]["qartod"]["gross_range_test"][20:28],
-            np.array([4, 4, 3, 1, 1, 3, 4, 4]),
+            SPAN_EDGE_FLAGS,
         )
         npt.assert_array_equal(
             results["variable2"]["qartod"]["gross_range_test"][28:50],
-            np.full((22,), 4),
+            4,
         )
 
+    def test_run_unsorted_time(self):
+        # Windows are found by bisection only when time is sorted, reversed rows
+        # take the masking path and must flag the same values
+        reversed_df = self.df.iloc[::-1].reset_index(drop=True)
+        results = collect_results(PandasStream(reversed_df).run(self.config), how="dict")
+        expected = collect_results(self.results, how="dict")
+
+        for stream_id in ("variable1", "variable2"):
+            with self.subTest(stream_id=stream_id):
+                npt.assert_array_equal(
+                    results[stream_id]["qartod"]["gross_range_test"],
+                    expected[stream_id]["qartod"]["gross_range_test"][::-1],
+                )
+
     def test_run_list_results(self):
-        ps = PandasStream(self.df)
-        results = ps.run(self.config)
-        results = collect_results(results, how="list")
+        results = collect_results(self.results, how="list")
 
         var1_gr = next(
             res
@@ -519,32 +410,32 @@ class PandasStreamManyContextTest(unittest.TestCase):
         # Actual data returned in full
         npt.assert_array_equal(
             var1_gr.data,
-            self.vardata,
+            VARDATA,
         )
         # QC tests
         npt.assert_array_equal(
             var1_gr.results[0:8],
-            np.array([4, 4, 3, 1, 1, 3, 4, 4]),
+            SPAN_EDGE_FLAGS,
         )
         npt.assert_array_equal(
             var1_gr.results[8:40],
-            np.full((32,), 4),
+            4,
         )
         npt.assert_array_equal(
             var1_gr.results[40:48],
-            np.array([4, 4, 3, 1, 1, 3, 4, 4]),
+            SPAN_EDGE_FLAGS,
         )
 
         # Variable 2
         npt.assert_array_equal(
             var2_gr.results[0:20],
-            np.full((20,), 4),
+            4,
         )
         npt.assert_array_equal(
             var2_gr.results[20:28],
-            np.array([4, 4, 3, 1, 1, 3, 4, 4]),
+            SPAN_EDGE_FLAGS,
         )
         npt.assert_array_equal(
             var2_gr.results[28:50],
-            np.full((22,), 4),
+            4,
         )
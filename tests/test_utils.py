@@ -3,11 +3,15 @@ import os
 import tempfile
 import time
 import unittest
+from datetime import timedelta
 from pathlib import Path
 
 import h5netcdf.legacyapi as nc4
 import numpy as np
+import pytest
 import xarray as xr
+from geographiclib.geodesic import Geodesic
+from kernels import python_kernel
 
 from ioos_qc import utils
 
@@ -41,6 +45,50 @@ class AuxillaryCheckTest(unittest.TestCase):
         interval = np.timedelta64(3, "m")
         assert not utils.check_timestamps(self.times, interval)
 
+    def test_datetime_objects(self):
+        """Check lists of datetime objects, whose differences are timedelta objects."""
+        times = self.times.astype("datetime64[us]").tolist()
+        assert utils.check_timestamps(times)
+        assert utils.check_timestamps(times, timedelta(minutes=15))
+        assert not utils.check_timestamps(times, timedelta(minutes=3))
+        assert not utils.check_timestamps(times[::-1])
+        assert not utils.check_timestamps([times[0], *times])
+
+    def test_long_series(self):
+        """Check series longer than one block, with a repeat or a gap either side of a boundary."""
+        times = np.arange(3 * utils._TIMESTAMP_BLOCK).astype("datetime64[us]")
+        series = {
+            "datetime64": (times, np.timedelta64(1, "s")),
+            "datetime": (times.astype(object), timedelta(seconds=1)),
+        }
+        for name, (values, interval) in series.items():
+            with self.subTest(times=name):
+                assert utils.check_timestamps(values, interval)
+            for i in (utils._TIMESTAMP_BLOCK - 1, utils._TIMESTAMP_BLOCK, times.size - 1):
+                with self.subTest(times=name, repeat=i):
+                    repeated = values.copy()
+                    repeated[i] = repeated[i - 1]
+                    assert not utils.check_timestamps(repeated)
+                with self.subTest(times=name, gap=i):
+                    gap = values.copy()
+                    gap[i:] = gap[i:] + interval
+                    assert utils.check_timestamps(gap)
+                    assert not utils.check_timestamps(gap, interval)
+
+
+class TestLoadConfigAsDict(unittest.TestCase):
+    def test_repeated_yaml_text_is_not_shared(self):
+        text = """
+            variable1:
+                qartod:
+                    gross_range_test:
+                        suspect_span: [20, 30]
+        """
+        first = utils.load_config_as_dict(text)
+        first["variable1"]["qartod"]["gross_range_test"]["suspect_span"].append(40)
+        second = utils.load_config_as_dict(text)
+        assert second["variable1"]["qartod"]["gross_range_test"]["suspect_span"] == [20, 30]
+
 
 class TestReadXarrayConfig(unittest.TestCase):
     def setUp(self):
@@ -89,3 +137,43 @@ class TestGreatCircle(unittest.TestCase):
         time.perf_counter()
         close = np.isclose(dist[1:-1], dist[2:], atol=1)
         assert close.all()
+
+    def _check_geodesic_kernel(self, kernel):
+        rng = np.random.default_rng(0)
+        # Random points, a repeated point, the poles and a nearly antipodal equator pair
+        lat = np.concatenate([rng.uniform(-90, 90, 1000), [10, 10, 90, -90, 0, 0]])
+        lon = np.concatenate([rng.uniform(-180, 180, 1000), [20, 20, 0, 0, 0, 179.9]])
+        dist = np.zeros(lat.size)
+        unresolved = np.zeros(lat.size, dtype=bool)
+        kernel(lat, lon, dist, unresolved)
+
+        assert unresolved[-1]
+        for i in np.flatnonzero(~unresolved[1:]) + 1:
+            expected = Geodesic.WGS84.Inverse(lat[i - 1], lon[i - 1], lat[i], lon[i])["s12"]
+            assert abs(dist[i] - expected) < 1e-3, (i, dist[i], expected)
+
+    def test_geodesic_kernel(self):
+        self._check_geodesic_kernel(python_kernel(utils._geodesic_kernel))
+
+    @pytest.mark.skipif(utils.njit is None, reason="numba is not installed")
+    def test_geodesic_kernel_compiled(self):
+        self._check_geodesic_kernel(utils._geodesic_kernel)
+
+
+class TestToFloatArray(unittest.TestCase):
+    def test_missing_values_become_nan(self):
+        expected = np.array([1.0, np.nan, np.nan, 4.0])
+        inputs = {
+            "list": [1, None, np.ma.masked, 4],
+            "object": np.array([1, None, np.nan, 4], dtype=object),
+            "masked": np.ma.masked_array([1, 2, 3, 4], mask=[False, True, True, False]),
+        }
+        for name, values in inputs.items():
+            with self.subTest(inp=name):
+                result = utils.to_float_array(values)
+                assert result.dtype == np.float64
+                np.testing.assert_array_equal(result, expected)
+
+    def test_nested_list(self):
+        result = utils.to_float_array([[1, None], [3, 4]])
+        np.testing.assert_array_equal(result, np.array([[1.0, np.nan], [3.0, 4.0]]))